@@ -14,6 +14,7 @@ import logging
 from typing import Optional
 from dotenv import load_dotenv
 import aiohttp
+import orjson
 
 from livekit.agents import (
     JobContext, JobProcess, Agent, AgentSession, AgentServer,
@@ -44,6 +45,35 @@ MAX_SESSION_DURATION = 30.0
 # Create the agent server
 server = AgentServer()
 
+# Shared HTTP session for backend calls (created lazily, reused across plays)
+_http_session: Optional[aiohttp.ClientSession] = None
+
+# Maximum number of backend POSTs in flight at once
+MAX_CONCURRENT_POSTS = 4
+_post_sem = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
+
+# Strong references to in-flight fire-and-forget POST tasks
+_pending_posts: set[asyncio.Task] = set()
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=5),
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+        )
+    return _http_session
+
+
+async def _close_session():
+    """Close the shared HTTP session if it is open."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
 
 class PlayState:
     """Tracks the current state of play detection."""
@@ -53,16 +83,19 @@ class PlayState:
         self.play_start_time: Optional[float] = None
         self.play_description: Optional[str] = None
         self.plays_detected: list = []
-        self.start_time = time.time()
+        self.start_time = time.time()  # Wall clock, for display only
+        self._start_monotonic = time.monotonic()
         self.is_watching = False
+        self._play_counter = 0
 
     def get_elapsed_time(self) -> float:
-        """Get elapsed time since session start."""
-        return time.time() - self.start_time
+        """Get elapsed time since session start (monotonic, immune to clock jumps)."""
+        return time.monotonic() - self._start_monotonic
 
     def start_play(self, description: str) -> str:
         """Start tracking a new play."""
-        self.current_play_id = f"play_{int(time.time() * 1000)}"
+        self._play_counter += 1
+        self.current_play_id = f"play_{self.session_id}_{self._play_counter}"
         self.play_start_time = self.get_elapsed_time()
         self.play_description = description
         logger.info(f"🎬 Play started: {description} at {self.play_start_time:.1f}s")
@@ -98,20 +131,22 @@ class PlayState:
 async def send_play_to_backend(play_data: dict):
     """Send detected play to Vibe Check backend."""
     try:
-        async with aiohttp.ClientSession() as http_session:
-            moment_data = {
-                "timestamp": play_data["start_time"],
-                "end_timestamp": play_data["end_time"],
-                "description": play_data["description"],
-                "excitement_level": play_data["excitement_rating"],
-                "source": "livekit_screenshare",
-                "session_id": play_data["session_id"],
-                "play_id": play_data["play_id"]
-            }
+        http_session = await _get_session()
+        moment_data = {
+            "timestamp": play_data["start_time"],
+            "end_timestamp": play_data["end_time"],
+            "description": play_data["description"],
+            "excitement_level": play_data["excitement_rating"],
+            "source": "livekit_screenshare",
+            "session_id": play_data["session_id"],
+            "play_id": play_data["play_id"]
+        }
 
+        async with _post_sem:
             async with http_session.post(
                 f"{BACKEND_URL}/api/moments/create_from_agent",
-                json=moment_data
+                data=orjson.dumps(moment_data),
+                headers={"Content-Type": "application/json"},
             ) as response:
                 if response.status == 200:
                     result = await response.json()
@@ -180,6 +215,10 @@ When I ask you to analyze, look at what's happening on screen and:
                 await self._analysis_task
             except asyncio.CancelledError:
                 pass
+        # Let in-flight backend POSTs finish before closing the shared session
+        if _pending_posts:
+            await asyncio.gather(*_pending_posts, return_exceptions=True)
+        await _close_session()
 
     async def _analysis_loop(self):
         """Periodically prompt the model to analyze what it's seeing."""
@@ -201,6 +240,10 @@ When I ask you to analyze, look at what's happening on screen and:
         self.play_state.is_watching = True
         logger.info("👁️ Starting continuous video analysis...")
 
+        # Schedule ticks on absolute deadlines so reply latency doesn't drift the cadence
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + ANALYSIS_INTERVAL
+
         analysis_count = 0
         while self.play_state.is_watching:
             try:
@@ -237,8 +280,18 @@ When I ask you to analyze, look at what's happening on screen and:
                 speech_handle = self.session.generate_reply(instructions=prompt)
                 await speech_handle
 
-                # Wait before next analysis
-                await asyncio.sleep(ANALYSIS_INTERVAL)
+                # Wait until the next scheduled tick
+                now = loop.time()
+                if now - next_tick > ANALYSIS_INTERVAL:
+                    # More than a full interval behind - resync instead of bursting
+                    logger.warning(
+                        f"🐢 Analysis #{analysis_count} ran {now - next_tick:.1f}s late, resyncing"
+                    )
+                    next_tick = now + ANALYSIS_INTERVAL
+                delay = next_tick - now
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_tick += ANALYSIS_INTERVAL
 
             except asyncio.CancelledError:
                 logger.info("Analysis loop cancelled")
@@ -283,8 +336,10 @@ When I ask you to analyze, look at what's happening on screen and:
         if "error" in play_data:
             return f"Error: {play_data['error']}. Call start_play first."
 
-        # Send to backend asynchronously
-        asyncio.create_task(send_play_to_backend(play_data))
+        # Send to backend asynchronously (concurrency bounded by _post_sem)
+        task = asyncio.create_task(send_play_to_backend(play_data))
+        _pending_posts.add(task)
+        task.add_done_callback(_pending_posts.discard)
 
         return f"Play recorded! Rating: {excitement_rating}/10. Keep watching!"
 
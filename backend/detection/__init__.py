@@ -1,6 +1,17 @@
 """Candidate detection module - Stage A (cheap signals)."""
 
-from .feature_extractor import FeatureExtractor
+from .feature_extractor import (
+    FeatureExtractor,
+    Features,
+    MOTION_VECTOR_DTYPE,
+    motion_from_vectors,
+)
 from .candidate_detector import CandidateDetector
 
-__all__ = ["FeatureExtractor", "CandidateDetector"]
+__all__ = [
+    "FeatureExtractor",
+    "Features",
+    "MOTION_VECTOR_DTYPE",
+    "motion_from_vectors",
+    "CandidateDetector",
+]
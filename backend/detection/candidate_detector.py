@@ -1,15 +1,86 @@
 """Candidate detector - decides when to trigger Gemini analysis."""
 
-from collections import deque
 import numpy as np
 from typing import Optional
 import logging
 import time
 
 from models import CandidateEvent, CandidateSignals
+from .feature_extractor import Features
+
+# Numba is optional - the numeric core runs as plain Python without it
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 logger = logging.getLogger(__name__)
 
+# Weights for [motion, scene_change, visual_energy] in the combined motion score
+FEATURE_WEIGHTS = np.array([0.5, 0.3, 0.2], np.float64)
+
+# Trigger reason codes returned by _candidate_core
+REASON_NONE = 0
+REASON_MOTION = 1
+REASON_AUDIO = 2
+REASON_COMBINED = 3
+
+
+def _candidate_core(
+    m_buf: np.ndarray,
+    a_buf: np.ndarray,
+    head: int,
+    count: int,
+    m_sum: float,
+    a_sum: float,
+    m_thr: float,
+    a_thr: float,
+    comb_thr_x2: float,
+    motion_score: float,
+    audio_rms: float,
+    cooling_down: bool,
+):
+    """
+    Numeric hot path of CandidateDetector.process_frame.
+
+    Pushes one sample into the smoothing ring buffers and evaluates the
+    trigger conditions.
+
+    Returns:
+        (head, count, m_sum, a_sum, reason, motion_smooth, audio_smooth)
+    """
+    window = m_buf.shape[0]
+
+    # Update histories (evict the oldest sample from the running sums)
+    m_sum += motion_score - m_buf[head]
+    a_sum += audio_rms - a_buf[head]
+    m_buf[head] = motion_score
+    a_buf[head] = audio_rms
+    head = (head + 1) % window
+    if count < window:
+        count += 1
+
+    # Compute smoothed signals (clamped: running sums can drift by an ulp)
+    motion_smooth = min(max(m_sum / count, 0.0), 1.0)
+    audio_smooth = min(max(a_sum / count, 0.0), 1.0)
+
+    # Histories keep updating during cooldown so smoothing isn't stale afterwards
+    reason = REASON_NONE
+    if not cooling_down:
+        if motion_smooth >= m_thr:
+            reason = REASON_MOTION
+        elif audio_smooth >= a_thr:
+            reason = REASON_AUDIO
+        elif motion_smooth + audio_smooth >= comb_thr_x2:
+            reason = REASON_COMBINED
+
+    return head, count, m_sum, a_sum, reason, motion_smooth, audio_smooth
+
+
+if HAS_NUMBA:
+    _candidate_core = njit(cache=True)(_candidate_core)
+
 
 class CandidateDetector:
     """
@@ -43,18 +114,33 @@ class CandidateDetector:
         self.cooldown_seconds = cooldown_seconds
         self.smoothing_window = smoothing_window
 
-        # Signal history for smoothing
-        self.motion_history: deque[float] = deque(maxlen=smoothing_window)
-        self.audio_history: deque[float] = deque(maxlen=smoothing_window)
+        # Compare the sum of smoothed signals against 2x the threshold (no division)
+        self._combined_sum_threshold = 2.0 * combined_threshold
+
+        # Signal history for smoothing: fixed ring buffers with running sums,
+        # so the moving average is O(1) per frame
+        self.motion_history = np.zeros(smoothing_window, np.float64)
+        self.audio_history = np.zeros(smoothing_window, np.float64)
+        self._history_head = 0
+        self._history_count = 0
+        self._motion_sum = 0.0
+        self._audio_sum = 0.0
 
         # State tracking
         self.last_trigger_time: Optional[float] = None
         self.candidate_counter = 0
 
+    def in_cooldown(self, timestamp: float) -> bool:
+        """Check if triggers are suppressed at this timestamp."""
+        return (
+            self.last_trigger_time is not None
+            and timestamp - self.last_trigger_time < self.cooldown_seconds
+        )
+
     def process_frame(
         self,
         timestamp: float,
-        features: dict,
+        features: Features | np.ndarray | dict,
         audio_rms: float = 0.5,
         fan_buzz: float = 0.0,
     ) -> Optional[CandidateEvent]:
@@ -63,86 +149,110 @@ class CandidateDetector:
 
         Args:
             timestamp: Current timestamp in seconds
-            features: Feature dict from FeatureExtractor
+            features: Features from FeatureExtractor, or its feature_vector
+                ([motion, scene_change, visual_energy]). Plain dicts with the
+                same keys are still accepted.
             audio_rms: Audio RMS level (0-1)
             fan_buzz: Fan reaction signal (0-1)
 
         Returns:
             CandidateEvent if triggered, None otherwise
         """
-        # Extract motion score (combine motion + scene_change + visual_energy)
-        motion = features.get("motion", 0.0)
-        scene_change = features.get("scene_change", 0.0)
-        visual_energy = features.get("visual_energy", 0.0)
-
-        # Combine visual signals (weighted average)
-        motion_score = (motion * 0.5) + (scene_change * 0.3) + (visual_energy * 0.2)
-
-        # Update histories
-        self.motion_history.append(motion_score)
-        self.audio_history.append(audio_rms)
-
-        # Compute smoothed signals
-        motion_smooth = np.mean(self.motion_history) if self.motion_history else 0.0
-        audio_smooth = np.mean(self.audio_history) if self.audio_history else 0.0
+        # Combine visual signals (weighted average of motion + scene_change + visual_energy)
+        if isinstance(features, np.ndarray):
+            motion_score = float(FEATURE_WEIGHTS @ features)
+        elif isinstance(features, Features):
+            motion_score = (
+                features.motion * FEATURE_WEIGHTS[0]
+                + features.scene_change * FEATURE_WEIGHTS[1]
+                + features.visual_energy * FEATURE_WEIGHTS[2]
+            )
+        else:
+            motion_score = (
+                features.get("motion", 0.0) * FEATURE_WEIGHTS[0]
+                + features.get("scene_change", 0.0) * FEATURE_WEIGHTS[1]
+                + features.get("visual_energy", 0.0) * FEATURE_WEIGHTS[2]
+            )
 
-        # Check cooldown
-        if self.last_trigger_time is not None:
-            time_since_last = timestamp - self.last_trigger_time
-            if time_since_last < self.cooldown_seconds:
-                return None
+        (
+            self._history_head,
+            self._history_count,
+            self._motion_sum,
+            self._audio_sum,
+            reason,
+            motion_smooth,
+            audio_smooth,
+        ) = _candidate_core(
+            self.motion_history,
+            self.audio_history,
+            self._history_head,
+            self._history_count,
+            self._motion_sum,
+            self._audio_sum,
+            self.motion_threshold,
+            self.audio_threshold,
+            self._combined_sum_threshold,
+            motion_score,
+            float(audio_rms),
+            self.in_cooldown(timestamp),
+        )
 
-        # Trigger conditions
-        triggered = False
-        trigger_reason = ""
+        if reason == REASON_NONE:
+            return None
 
+        # Trigger conditions:
         # 1. High motion alone
-        if motion_smooth >= self.motion_threshold:
-            triggered = True
-            trigger_reason = f"motion_peak={motion_smooth:.2f}"
-
         # 2. High audio alone
-        elif audio_smooth >= self.audio_threshold:
-            triggered = True
+        # 3. Combined signal (moderate motion + moderate audio)
+        if reason == REASON_MOTION:
+            trigger_reason = f"motion_peak={motion_smooth:.2f}"
+        elif reason == REASON_AUDIO:
             trigger_reason = f"audio_peak={audio_smooth:.2f}"
+        else:
+            trigger_reason = f"combined={(motion_smooth + audio_smooth) * 0.5:.2f}"
 
-        # 3. Combined signal (moderate motion + moderate audio)
-        elif (motion_smooth + audio_smooth) / 2 >= self.combined_threshold:
-            triggered = True
-            trigger_reason = f"combined={((motion_smooth + audio_smooth) / 2):.2f}"
-
-        if triggered:
-            self.candidate_counter += 1
-            self.last_trigger_time = timestamp
-
-            # Audio peak indicates crowd reaction AFTER the play
-            # Set t0 to 10 seconds BEFORE the audio peak to capture the actual action
-            lookback_seconds = 10.0
-            play_start_time = max(0.0, timestamp - lookback_seconds)
-
-            candidate = CandidateEvent(
-                candidate_id=f"c_{self.candidate_counter:04d}",
-                t0=play_start_time,  # Action starts BEFORE crowd reacts
-                signals=CandidateSignals(
-                    motion=motion_smooth,
-                    audio_rms=audio_smooth,
-                    fan_buzz=fan_buzz,
-                ),
-            )
+        self.candidate_counter += 1
+        self.last_trigger_time = timestamp
 
-            logger.info(
-                f"🔔 Candidate detected: audio peak at t={timestamp:.2f}s, "
-                f"play starts at t={play_start_time:.2f}s: {trigger_reason} "
-                f"(motion={motion_smooth:.2f}, audio={audio_smooth:.2f})"
-            )
+        # Audio peak indicates crowd reaction AFTER the play
+        # Set t0 to 10 seconds BEFORE the audio peak to capture the actual action
+        lookback_seconds = 10.0
+        play_start_time = max(0.0, timestamp - lookback_seconds)
+
+        candidate = CandidateEvent(
+            candidate_id="c_" + str(self.candidate_counter).zfill(4),
+            t0=play_start_time,  # Action starts BEFORE crowd reacts
+            signals=CandidateSignals(
+                motion=motion_smooth,
+                audio_rms=audio_smooth,
+                fan_buzz=fan_buzz,
+            ),
+        )
+
+        logger.info(
+            f"🔔 Candidate detected: audio peak at t={timestamp:.2f}s, "
+            f"play starts at t={play_start_time:.2f}s: {trigger_reason} "
+            f"(motion={motion_smooth:.2f}, audio={audio_smooth:.2f})"
+        )
 
-            return candidate
+        return candidate
 
-        return None
+    @staticmethod
+    def warmup():
+        """Compile the numba detector core ahead of the first real frame."""
+        if not HAS_NUMBA:
+            return
+        buf = np.zeros(1, np.float64)
+        _candidate_core(buf, buf.copy(), 0, 0, 0.0, 0.0, 1.0, 1.0, 2.0, 0.0, 0.0, False)
+        logger.debug("Candidate detector core compiled")
 
     def reset(self):
         """Reset detector state."""
-        self.motion_history.clear()
-        self.audio_history.clear()
+        self.motion_history.fill(0.0)
+        self.audio_history.fill(0.0)
+        self._history_head = 0
+        self._history_count = 0
+        self._motion_sum = 0.0
+        self._audio_sum = 0.0
         self.last_trigger_time = None
         logger.debug("Candidate detector state reset")
@@ -2,11 +2,144 @@
 
 import cv2
 import numpy as np
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple
 import logging
 
+# Numba is optional - fall back to OpenCV kernels when it isn't installed
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+# Pixel difference above which a pixel counts as "moving"
+MOTION_DIFF_THRESHOLD = 25
+
+# Resolution all features are computed at (width, height). Downsampling once
+# keeps the working set cache-resident instead of re-reading full-res frames.
+ANALYSIS_SIZE = (320, 180)
+
+# Laplacian variance normalizer, measured at ANALYSIS_SIZE (area downsampling
+# raises the variance ~7x relative to 1080p, where the old constant was 1000)
+VISUAL_ENERGY_NORM = 7000.0
+
+# Codec motion vector layout (FFmpeg AVMotionVector, as exported by PyAV)
+MOTION_VECTOR_DTYPE = np.dtype([
+    ("source", "<i4"), ("w", "u1"), ("h", "u1"),
+    ("src_x", "<i2"), ("src_y", "<i2"), ("dst_x", "<i2"), ("dst_y", "<i2"),
+    ("flags", "<u8"), ("motion_x", "<i4"), ("motion_y", "<i4"), ("motion_scale", "<u2"),
+], align=True)
+
+# Block displacement (|dx| + |dy|, in pixels) above which a block counts as "moving"
+MV_MOTION_THRESHOLD = 2
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _motion_count(prev: np.ndarray, cur: np.ndarray, thr: int) -> int:
+        """Count pixels whose absolute difference exceeds thr (single pass)."""
+        n = 0
+        for i in prange(prev.shape[0]):
+            row = 0
+            for j in range(prev.shape[1]):
+                d = np.int32(prev[i, j]) - np.int32(cur[i, j])
+                if d < 0:
+                    d = -d
+                if d > thr:
+                    row += 1
+            n += row
+        return n
+
+    @njit(cache=True, nogil=True)
+    def _hist888(frame: np.ndarray) -> np.ndarray:
+        """8x8x8 BGR histogram as a flat 512-bin array (same bins as calcHist)."""
+        h = np.zeros(512, np.int32)
+        H, W, _ = frame.shape
+        for i in range(H):
+            for j in range(W):
+                b = frame[i, j, 0] >> 5
+                g = frame[i, j, 1] >> 5
+                r = frame[i, j, 2] >> 5
+                h[(b << 6) | (g << 3) | r] += 1
+        return h
+
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _lap_var(g: np.ndarray) -> float:
+        """Variance of the 4-neighbour Laplacian over the frame interior."""
+        H, W = g.shape
+        # Integer accumulators: |v| <= 1020, so v*v fits in int32 and sums in int64
+        s = 0
+        s2 = 0
+        n = 0
+        for i in prange(1, H - 1):
+            for j in range(1, W - 1):
+                v = (
+                    4 * np.int32(g[i, j])
+                    - np.int32(g[i - 1, j])
+                    - np.int32(g[i + 1, j])
+                    - np.int32(g[i, j - 1])
+                    - np.int32(g[i, j + 1])
+                )
+                s += v
+                s2 += v * v
+                n += 1
+        if n == 0:
+            return 0.0
+        mean = s / n
+        return s2 / n - mean * mean
+
+
+def _hist_correlation(h1: np.ndarray, h2: np.ndarray) -> float:
+    """
+    Pearson correlation between two raw-count histograms (matches HISTCMP_CORREL).
+
+    Works on integer counts with int64 accumulators - correlation is scale
+    invariant, so no normalization pass is needed.
+    """
+    x = h1.astype(np.int64, copy=False)
+    y = h2.astype(np.int64, copy=False)
+    n = x.shape[0]
+    sx = int(x.sum())
+    sy = int(y.sum())
+    cov = n * int(x @ y) - sx * sy
+    var_x = n * int(x @ x) - sx * sx
+    var_y = n * int(y @ y) - sy * sy
+    if var_x == 0 or var_y == 0:
+        return 1.0
+    return cov / float(np.sqrt(float(var_x) * float(var_y)))
+
+
+def motion_from_vectors(motion_vectors: np.ndarray, frame_area: int) -> float:
+    """
+    Motion score from codec motion vectors, on the same scale as the pixel path.
+
+    Counts the area of blocks displaced by more than MV_MOTION_THRESHOLD
+    instead of pixels changed by more than MOTION_DIFF_THRESHOLD. Only vectors
+    into past frames are used, so bidirectional B-frame blocks count once.
+
+    Args:
+        motion_vectors: Structured array with MOTION_VECTOR_DTYPE fields
+        frame_area: Width * height of the decoded frame, in pixels
+    """
+    mv = motion_vectors[motion_vectors["source"] < 0]
+    displacement = (
+        np.abs(mv["dst_x"].astype(np.int32) - mv["src_x"])
+        + np.abs(mv["dst_y"].astype(np.int32) - mv["src_y"])
+    )
+    moving = displacement > MV_MOTION_THRESHOLD
+    block_area = mv["w"].astype(np.int32) * mv["h"]
+    moving_area = int(block_area[moving].sum(dtype=np.int64))
+    return min(moving_area / frame_area * 10, 1.0)
+
+
+class Features(NamedTuple):
+    """Per-frame feature scores (0-1 normalized)."""
+    motion: float
+    scene_change: float
+    visual_energy: float
+
 
 class FeatureExtractor:
     """
@@ -22,30 +155,96 @@ class FeatureExtractor:
         self.prev_frame_gray: Optional[np.ndarray] = None
         self.prev_histogram: Optional[np.ndarray] = None
 
-    def extract_features(self, frame: np.ndarray) -> dict:
+        # Preallocated work buffers. Grayscale frames ping-pong between two
+        # buffers so the previous frame is kept without a per-frame copy.
+        width, height = ANALYSIS_SIZE
+        self._small = np.empty((height, width, 3), np.uint8)
+        self._gray_bufs = [
+            np.empty((height, width), np.uint8),
+            np.empty((height, width), np.uint8),
+        ]
+        self._gray_idx = 0
+        # Frame difference scratch buffer for the non-numba motion path
+        self._diff = np.empty((height, width), np.uint8)
+
+        # Reused [motion, scene_change, visual_energy] vector for the latest frame
+        self.feature_vector = np.zeros(3, np.float64)
+
+        # Last motion vector score, carried over frames without vectors (I-frames)
+        self._last_mv_motion = 0.0
+
+    def extract_features(self, frame: np.ndarray, full: bool = True) -> Features:
         """
         Extract all features from a frame.
 
         Args:
             frame: BGR frame from OpenCV (H, W, 3)
+            full: If False, only compute motion (scene_change and visual_energy
+                are reported as 0.0). Used while the detector is cooling down.
 
         Returns:
-            Dictionary with feature scores (0-1 normalized)
+            Features tuple with scores (0-1 normalized)
         """
-        # Convert to grayscale for processing
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Downsample once and share the small buffer across all features
+        small = cv2.resize(
+            frame, ANALYSIS_SIZE, dst=self._small, interpolation=cv2.INTER_AREA
+        )
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray_bufs[self._gray_idx])
+
+        motion = self._compute_motion_score(gray)
+        if full:
+            scene_change = self._detect_scene_change(small)
+            visual_energy = self._compute_visual_energy(gray)
+        else:
+            scene_change = 0.0
+            visual_energy = 0.0
+            # Histogram is stale after a gated window - restart comparison
+            self.prev_histogram = None
 
-        features = {
-            "motion": self._compute_motion_score(gray),
-            "scene_change": self._detect_scene_change(frame),
-            "visual_energy": self._compute_visual_energy(gray),
-        }
+        features = Features(motion, scene_change, visual_energy)
+        vec = self.feature_vector
+        vec[0] = motion
+        vec[1] = scene_change
+        vec[2] = visual_energy
 
-        # Update state for next frame
-        self.prev_frame_gray = gray.copy()
+        # Update state for next frame: keep this buffer, write into the other
+        self.prev_frame_gray = gray
+        self._gray_idx ^= 1
 
         return features
 
+    def extract_motion_features(
+        self,
+        motion_vectors: Optional[np.ndarray],
+        frame_size: Tuple[int, int],
+    ) -> Features:
+        """
+        Extract motion from codec motion vectors, without touching pixels.
+
+        Fast path for VideoIngester.ingest_motion_vectors: the motion score is
+        a reduction over the decoder's block vectors rather than a full-frame
+        difference. scene_change and visual_energy are reported as 0.0.
+
+        Args:
+            motion_vectors: MOTION_VECTOR_DTYPE array, or None for frames with
+                no vectors (intra-coded); the previous motion score is kept
+            frame_size: (width, height) of the decoded frame
+
+        Returns:
+            Features tuple with scores (0-1 normalized)
+        """
+        if motion_vectors is not None:
+            self._last_mv_motion = motion_from_vectors(
+                motion_vectors, frame_size[0] * frame_size[1]
+            )
+        motion = self._last_mv_motion
+
+        vec = self.feature_vector
+        vec[0] = motion
+        vec[1] = 0.0
+        vec[2] = 0.0
+        return Features(motion, 0.0, 0.0)
+
     def _compute_motion_score(self, gray_frame: np.ndarray) -> float:
         """
         Compute motion score using frame difference.
@@ -55,15 +254,21 @@ class FeatureExtractor:
         if self.prev_frame_gray is None:
             return 0.0
 
-        # Compute absolute difference
-        diff = cv2.absdiff(self.prev_frame_gray, gray_frame)
+        if HAS_NUMBA:
+            # Fused absdiff + threshold + count in one pass over the frame
+            motion_pixels = _motion_count(
+                self.prev_frame_gray, gray_frame, MOTION_DIFF_THRESHOLD
+            )
+        else:
+            # Compute absolute difference
+            diff = cv2.absdiff(self.prev_frame_gray, gray_frame, dst=self._diff)
 
-        # Threshold to remove noise
-        _, thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+            # Threshold to remove noise (in place, no per-frame allocation)
+            cv2.threshold(diff, MOTION_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=diff)
+            motion_pixels = cv2.countNonZero(diff)
 
         # Normalize by image size
-        motion_pixels = np.sum(thresh > 0)
-        total_pixels = thresh.shape[0] * thresh.shape[1]
+        total_pixels = gray_frame.shape[0] * gray_frame.shape[1]
         motion_score = motion_pixels / total_pixels
 
         # Clamp to 0-1 range
@@ -74,17 +279,23 @@ class FeatureExtractor:
         Detect scene changes using histogram comparison.
 
         Large changes indicate shot boundaries or dramatic transitions.
+
+        Args:
+            frame: Downsampled BGR frame (see ANALYSIS_SIZE)
         """
-        # Compute color histogram
-        hist = cv2.calcHist([frame], [0, 1, 2], None, [8, 8, 8], [0, 256, 0, 256, 0, 256])
-        hist = cv2.normalize(hist, hist).flatten()
+        # Compute color histogram (raw integer counts, no normalize pass)
+        if HAS_NUMBA:
+            hist = _hist888(frame)
+        else:
+            hist = cv2.calcHist([frame], [0, 1, 2], None, [8, 8, 8], [0, 256, 0, 256, 0, 256])
+            hist = hist.ravel().astype(np.int32)
 
         if self.prev_histogram is None:
             self.prev_histogram = hist
             return 0.0
 
         # Compare histograms using correlation
-        correlation = cv2.compareHist(self.prev_histogram, hist, cv2.HISTCMP_CORREL)
+        correlation = _hist_correlation(self.prev_histogram, hist)
 
         # Update state
         self.prev_histogram = hist
@@ -99,15 +310,41 @@ class FeatureExtractor:
 
         Higher values = more visual activity/detail.
         """
-        laplacian = cv2.Laplacian(gray_frame, cv2.CV_64F)
-        variance = laplacian.var()
+        if HAS_NUMBA:
+            # Streaming stencil - no float64 Laplacian image is materialized
+            variance = _lap_var(gray_frame)
+        else:
+            # 16-bit Laplacian (8-bit input fits in 11 bits), variance in int64
+            laplacian = cv2.Laplacian(gray_frame, cv2.CV_16S).astype(np.int32)
+            n = laplacian.size
+            s = int(laplacian.sum(dtype=np.int64))
+            s2 = int((laplacian * laplacian).sum(dtype=np.int64))
+            mean = s / n
+            variance = s2 / n - mean * mean
 
         # Normalize to 0-1 (empirically tuned threshold)
-        energy_score = min(variance / 1000.0, 1.0)
+        energy_score = min(variance / VISUAL_ENERGY_NORM, 1.0)
         return energy_score
 
+    @staticmethod
+    def warmup():
+        """
+        Compile the numba kernels ahead of the first real frame.
+
+        With cache=True the compiled code is reused on later process launches,
+        so this is only slow the first time.
+        """
+        if not HAS_NUMBA:
+            return
+        gray = np.zeros((16, 16), np.uint8)
+        _motion_count(gray, gray, MOTION_DIFF_THRESHOLD)
+        _lap_var(gray)
+        _hist888(np.zeros((16, 16, 3), np.uint8))
+        logger.debug("Feature extractor kernels compiled")
+
     def reset(self):
         """Reset internal state (e.g., when starting a new video)."""
         self.prev_frame_gray = None
         self.prev_histogram = None
+        self._last_mv_motion = 0.0
         logger.debug("Feature extractor state reset")
@@ -2,27 +2,348 @@
 
 import os
 import logging
-from typing import Optional
+import asyncio
+import time
+import base64
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import random
 import google.generativeai as genai
-from PIL import Image
+from google.api_core import exceptions as gapi_exceptions
 import io
+import cv2
 import numpy as np
 import json
+import re
 
-from models import MomentAnalysis, MomentType, MomentScores, PostCopy, ClipRecipe, PlayerInfo, MatchStats
+from pydantic import ValidationError
+from models import (
+    MomentAnalysis, MomentType, MomentScores, PostCopy, ClipRecipe, PlayerInfo, MatchStats,
+    CLIP_RECIPE_ADAPTER,
+)
 from .prompts import build_analysis_prompt, build_player_identification_prompt, build_search_grounding_prompt
 
 # Try to import new google-genai SDK for search grounding
 try:
     from google import genai as genai_new
     from google.genai import types
+    from google.genai import errors as genai_errors
     HAS_SEARCH_GROUNDING = True
 except ImportError:
     HAS_SEARCH_GROUNDING = False
     logging.warning("google-genai SDK not available. Search grounding will be disabled.")
 
+# orjson is optional - used for parsing responses, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers match.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Numba is optional - fall back to the pure-Python JSON scan when it isn't installed
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+# JSON cleanup / extraction patterns used by _parse_response
+_COMMENT_RE = re.compile(r'//.*?\n|/\*.*?\*/', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_MD_JSON_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_OBJ_RE = re.compile(r'\{.*', re.DOTALL)
+
+# Longest edge keyframes are downscaled to before being sent to Gemini.
+# Enough detail to identify the moment; Gemini rescales larger images anyway.
+MAX_IMAGE_DIM = 1024
+JPEG_QUALITY = 85
+
+# Output token caps. A moment analysis JSON is a few hundred tokens, but
+# Gemini 3 counts thinking tokens against the cap too, so leave headroom.
+# Whole-video analysis gets a larger cap.
+MAX_OUTPUT_TOKENS = 8192
+VIDEO_MAX_OUTPUT_TOKENS = 32000
+
+# Keyframes are JPEG-encoded in parallel (cv2.imencode releases the GIL)
+_ENCODE_POOL = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="keyframe-encode"
+)
+
+# Give up on a Files API video that is still processing after this many seconds
+VIDEO_PROCESSING_TIMEOUT = 600.0
+
+# Retry policy for transient Gemini errors (429 / 5xx / timeouts)
+RETRY_ATTEMPTS = 4
+RETRY_MIN_WAIT = 1.0
+RETRY_MAX_WAIT = 30.0
+
+# Circuit breaker: after this many consecutive failed calls, skip Gemini
+# (callers use their fallback) until the reset timeout has passed
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_TIMEOUT = 60.0
+
+_TRANSIENT_ERRORS = (
+    gapi_exceptions.ServiceUnavailable,
+    gapi_exceptions.ResourceExhausted,
+    gapi_exceptions.DeadlineExceeded,
+    gapi_exceptions.InternalServerError,
+    TimeoutError,
+)
+
+
+def _is_transient(exc: Exception) -> bool:
+    """True for errors worth retrying (rate limits, server errors, timeouts)."""
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    if HAS_SEARCH_GROUNDING and isinstance(exc, genai_errors.APIError):
+        return exc.code in (429, 500, 502, 503, 504)
+    return False
+
+
+def _retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+    return random.uniform(RETRY_MIN_WAIT, min(RETRY_MAX_WAIT, RETRY_MIN_WAIT * 2 ** (attempt + 1)))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Gemini while the circuit breaker is open."""
+
+
+class _CircuitBreaker:
+    """Minimal consecutive-failure circuit breaker (closed -> open -> half-open)."""
+
+    def __init__(self, fail_max: int = BREAKER_FAIL_MAX, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError("Gemini circuit breaker is open")
+            # Half-open: let this call through as a probe
+            self._opened_at = None
+            self._failures = self.fail_max - 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                logger.error(
+                    f"⚡ Gemini circuit breaker opened after {self._failures} failures "
+                    f"(retrying in {self.reset_timeout:.0f}s)"
+                )
+
+
+def _dedupe_segments(
+    on_segment: Optional[Callable[[ClipRecipe], None]],
+) -> Optional[Callable[[ClipRecipe], None]]:
+    """Wrap a clip segment callback so retried streams don't re-deliver segments."""
+    if on_segment is None:
+        return None
+    seen = set()
+
+    def wrapper(seg: ClipRecipe):
+        key = (seg.label, seg.start_s, seg.end_s)
+        if key not in seen:
+            seen.add(key)
+            on_segment(seg)
+
+    return wrapper
+
+
+# moment_type string -> enum member, so parsing is one dict lookup instead of
+# a membership test followed by the Enum constructor's own value lookup
+_MOMENT_TYPES = {t.value: t for t in MomentType}
+
+
+def _scan_json(buf):
+    """
+    Single left-to-right scan of (possibly truncated) JSON bytes.
+
+    Tracks string/escape state and a stack of pending closers, and records the
+    last position the document can be safely cut at (after an opening or
+    closing brace/bracket, or before a comma).
+
+    Returns:
+        Tuple of (cut position, open depth at cut, stack of closer bytes).
+        The cut is len(buf) when the document ends on a complete value.
+    """
+    n = len(buf)
+    stack = np.empty(n + 1, np.uint8)
+    depth = 0
+    in_str = False
+    esc = False
+    is_key = False
+    last_sig = 0
+    cut = 0
+    cut_depth = 0
+
+    for i in range(n):
+        c = buf[i]
+        if in_str:
+            if esc:
+                esc = False
+            elif c == 92:  # backslash
+                esc = True
+            elif c == 34:  # closing quote
+                in_str = False
+                last_sig = 75 if is_key else 34  # 'K' marks an object key
+        elif c == 34:
+            in_str = True
+            is_key = depth > 0 and stack[depth - 1] == 125 and (last_sig == 123 or last_sig == 44)
+        elif c == 123 or c == 91:  # { [
+            stack[depth] = 125 if c == 123 else 93
+            depth += 1
+            last_sig = c
+            cut = i + 1
+            cut_depth = depth
+        elif c == 125 or c == 93:  # } ]
+            if depth > 0:
+                depth -= 1
+            last_sig = c
+            cut = i + 1
+            cut_depth = depth
+        elif c == 44:  # , - cut before it so no trailing comma survives
+            last_sig = c
+            cut = i
+            cut_depth = depth
+        elif c != 32 and c != 10 and c != 13 and c != 9:
+            last_sig = c
+
+    # Ends on a complete value (string, container, number)
+    if not in_str and (
+        last_sig == 34 or last_sig == 125 or last_sig == 93 or (48 <= last_sig <= 57)
+    ):
+        return n, depth, stack
+
+    # A trailing e/l only completes the value if the token is a whole
+    # true/false/null - a truncated "nul" or "fals" is cut back like any
+    # other partial value
+    if not in_str and (last_sig == 101 or last_sig == 108):
+        k = n
+        while k > 0 and (buf[k - 1] == 32 or buf[k - 1] == 10 or buf[k - 1] == 13 or buf[k - 1] == 9):
+            k -= 1
+        if k >= 4 and (
+            (buf[k - 4] == 116 and buf[k - 3] == 114 and buf[k - 2] == 117 and buf[k - 1] == 101)  # true
+            or (buf[k - 4] == 110 and buf[k - 3] == 117 and buf[k - 2] == 108 and buf[k - 1] == 108)  # null
+            or (k >= 5 and buf[k - 5] == 102 and buf[k - 4] == 97 and buf[k - 3] == 108
+                and buf[k - 2] == 115 and buf[k - 1] == 101)  # false
+        ):
+            return n, depth, stack
+
+    return cut, cut_depth, stack
+
+
+if HAS_NUMBA:
+    _scan_json = njit(cache=True, nogil=True)(_scan_json)
+
+
+class _ClipRecipeStream:
+    """
+    Incrementally pulls clip_recipe segments out of a streamed JSON response.
+
+    Each segment is reported as soon as its object closes, so callers can
+    start clip extraction before the rest of the response is generated.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, on_segment: Callable[[ClipRecipe], None]):
+        self.on_segment = on_segment
+        self.parts: list[str] = []
+        self._buf = ""
+        self._pos = -1  # Position inside the clip_recipe array (-1: not found yet)
+        self._done = False
+
+    def feed(self, text: str):
+        self.parts.append(text)
+        if self._done:
+            return
+        self._buf += text
+
+        if self._pos < 0:
+            key = self._buf.find('"clip_recipe"')
+            start = self._buf.find('[', key) if key >= 0 else -1
+            if start < 0:
+                return
+            self._pos = start + 1
+
+        buf = self._buf
+        while True:
+            # Skip separators between array elements
+            while self._pos < len(buf) and buf[self._pos] in " \t\r\n,":
+                self._pos += 1
+            if self._pos >= len(buf):
+                return
+            if buf[self._pos] == ']':
+                self._done = True
+                return
+            try:
+                seg, self._pos = self._decoder.raw_decode(buf, self._pos)
+            except json.JSONDecodeError:
+                return  # Element not complete yet
+            try:
+                self.on_segment(ClipRecipe(**seg))
+            except Exception as e:
+                logger.warning(f"Failed to handle streamed clip segment: {e}")
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+# Models and clients are shared process-wide so every analyzer (and every
+# concurrent call) reuses the same keep-alive connection pools instead of
+# paying TCP + TLS setup per instance.
+_shared_lock = threading.Lock()
+_configured_api_key: Optional[str] = None
+_shared_models: dict[tuple, "genai.GenerativeModel"] = {}
+_shared_clients: dict[str, "genai_new.Client"] = {}
+
+
+def _get_shared_model(api_key: str, model_name: str, generation_config: dict) -> "genai.GenerativeModel":
+    """Return the process-wide GenerativeModel for (api_key, model_name, config)."""
+    global _configured_api_key
+    key = (api_key, model_name, tuple(sorted(generation_config.items())))
+    with _shared_lock:
+        # genai.configure() replaces the SDK's default clients, so only call it
+        # when the key actually changes
+        if _configured_api_key != api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+        model = _shared_models.get(key)
+        if model is None:
+            model = _shared_models[key] = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config,
+            )
+        return model
+
+
+def _get_shared_client(api_key: str) -> "genai_new.Client":
+    """Return the process-wide google-genai Client for api_key."""
+    with _shared_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            client = _shared_clients[api_key] = genai_new.Client(api_key=api_key)
+        return client
+
 
 class GeminiAnalyzer:
     """
@@ -36,6 +357,8 @@ class GeminiAnalyzer:
         self,
         api_key: Optional[str] = None,
         model_name: str = "gemini-3-flash-preview",  # Using Gemini 3 Flash preview
+        upload_keyframes: bool = False,
+        max_output_tokens: int = MAX_OUTPUT_TOKENS,
     ):
         """
         Initialize Gemini analyzer.
@@ -43,6 +366,10 @@ class GeminiAnalyzer:
         Args:
             api_key: Google API key (defaults to GOOGLE_API_KEY env var)
             model_name: Gemini model to use
+            upload_keyframes: Upload keyframes once via the Files API and
+                reference them from every call for a moment (player
+                identification + analysis) instead of sending inline images
+            max_output_tokens: Output token cap for moment analysis calls
         """
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
@@ -50,28 +377,27 @@ class GeminiAnalyzer:
                 "GOOGLE_API_KEY not found. Set it in .env or pass as parameter."
             )
 
-        # Configure Gemini (old SDK)
-        genai.configure(api_key=self.api_key)
-
+        self.model_name = model_name
+        self.upload_keyframes = upload_keyframes
         # Initialize model with structured output schema
         generation_config = {
             "temperature": 0.7,
             "top_p": 0.95,
             "top_k": 40,
-            "max_output_tokens": 32000,  # Gemini 3 Flash supports up to 65536
+            "max_output_tokens": max_output_tokens,  # Gemini 3 Flash supports up to 65536
             "response_mime_type": "application/json",
         }
 
-        self.model = genai.GenerativeModel(
-            model_name=model_name,
-            generation_config=generation_config,
-        )
+        self.generation_config = generation_config
+        self.model = _get_shared_model(self.api_key, model_name, generation_config)
 
         # Initialize new SDK client for search grounding if available
+        self._breaker = _CircuitBreaker()
+
         self.search_client = None
         if HAS_SEARCH_GROUNDING:
             try:
-                self.search_client = genai_new.Client(api_key=self.api_key)
+                self.search_client = _get_shared_client(self.api_key)
                 logger.info("✅ Search grounding enabled via google-genai SDK")
             except Exception as e:
                 logger.warning(f"Failed to initialize search client: {e}")
@@ -79,15 +405,247 @@ class GeminiAnalyzer:
 
         logger.info(f"🤖 Gemini analyzer initialized with model: {model_name}")
 
+    def _generate(
+        self,
+        contents: list,
+        service_tier: Optional[str] = None,
+        on_clip_segment: Optional[Callable[[ClipRecipe], None]] = None,
+        max_output_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Run a Gemini call with retries and the circuit breaker.
+
+        Transient errors (429 / 5xx / timeouts) are retried with jittered
+        exponential backoff; anything else, exhausted retries, or an open
+        breaker raise to the caller (which falls back). Arguments are as for
+        _generate_once.
+        """
+        self._breaker.before_call()
+        on_clip_segment = _dedupe_segments(on_clip_segment)
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                result = self._generate_once(
+                    contents, service_tier, on_clip_segment, max_output_tokens
+                )
+            except Exception as e:
+                if attempt == RETRY_ATTEMPTS - 1 or not _is_transient(e):
+                    self._breaker.record_failure()
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+            else:
+                self._breaker.record_success()
+                return result
+
+    async def _generate_async(
+        self,
+        contents: list,
+        service_tier: Optional[str] = None,
+        on_clip_segment: Optional[Callable[[ClipRecipe], None]] = None,
+        max_output_tokens: Optional[int] = None,
+    ) -> str:
+        """Async counterpart of _generate (same retry policy and breaker)."""
+        self._breaker.before_call()
+        on_clip_segment = _dedupe_segments(on_clip_segment)
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                result = await self._generate_once_async(
+                    contents, service_tier, on_clip_segment, max_output_tokens
+                )
+            except Exception as e:
+                if attempt == RETRY_ATTEMPTS - 1 or not _is_transient(e):
+                    self._breaker.record_failure()
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            else:
+                self._breaker.record_success()
+                return result
+
+    def _generate_once(
+        self,
+        contents: list,
+        service_tier: Optional[str] = None,
+        on_clip_segment: Optional[Callable[[ClipRecipe], None]] = None,
+        max_output_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Run a generate_content call and return the response text.
+
+        The old SDK has no service tier support, so tiered calls go through
+        the google-genai client. If the tiered request fails (tier unavailable,
+        SDK missing) we log it and fall back to a standard request.
+
+        Args:
+            contents: Old-SDK contents (prompt + inline image blobs / uploaded files)
+            service_tier: "priority", "standard", "flex" or None for default
+            on_clip_segment: If given, the response is streamed and this is
+                called with each clip_recipe segment as soon as it is parsed
+            max_output_tokens: Per-call override of the output token cap
+        """
+        overrides = {"max_output_tokens": max_output_tokens} if max_output_tokens else {}
+
+        if service_tier and self.search_client:
+            try:
+                config = types.GenerateContentConfig(
+                    **{**self.generation_config, **overrides},
+                    service_tier=service_tier,
+                )
+                if on_clip_segment is not None:
+                    stream = _ClipRecipeStream(on_clip_segment)
+                    for chunk in self.search_client.models.generate_content_stream(
+                        model=self.model_name,
+                        contents=self._to_new_sdk_contents(contents),
+                        config=config,
+                    ):
+                        stream.feed(chunk.text or "")
+                    return stream.text
+
+                response = self.search_client.models.generate_content(
+                    model=self.model_name,
+                    contents=self._to_new_sdk_contents(contents),
+                    config=config,
+                )
+                return response.text
+            except Exception as e:
+                logger.warning(f"Service tier '{service_tier}' request failed, using standard: {e}")
+        elif service_tier:
+            logger.debug(f"google-genai SDK not available, ignoring service tier '{service_tier}'")
+
+        if on_clip_segment is not None:
+            stream = _ClipRecipeStream(on_clip_segment)
+            for chunk in self.model.generate_content(
+                contents, stream=True, generation_config=overrides or None
+            ):
+                stream.feed(chunk.text)
+            return stream.text
+
+        response = self.model.generate_content(contents, generation_config=overrides or None)
+        return response.text
+
+    async def _generate_once_async(
+        self,
+        contents: list,
+        service_tier: Optional[str] = None,
+        on_clip_segment: Optional[Callable[[ClipRecipe], None]] = None,
+        max_output_tokens: Optional[int] = None,
+    ) -> str:
+        """Async counterpart of _generate_once (same tier routing, fallback and streaming)."""
+        overrides = {"max_output_tokens": max_output_tokens} if max_output_tokens else {}
+
+        if service_tier and self.search_client:
+            try:
+                config = types.GenerateContentConfig(
+                    **{**self.generation_config, **overrides},
+                    service_tier=service_tier,
+                )
+                if on_clip_segment is not None:
+                    stream = _ClipRecipeStream(on_clip_segment)
+                    async for chunk in await self.search_client.aio.models.generate_content_stream(
+                        model=self.model_name,
+                        contents=self._to_new_sdk_contents(contents),
+                        config=config,
+                    ):
+                        stream.feed(chunk.text or "")
+                    return stream.text
+
+                response = await self.search_client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=self._to_new_sdk_contents(contents),
+                    config=config,
+                )
+                return response.text
+            except Exception as e:
+                logger.warning(f"Service tier '{service_tier}' request failed, using standard: {e}")
+
+        if on_clip_segment is not None:
+            stream = _ClipRecipeStream(on_clip_segment)
+            async for chunk in await self.model.generate_content_async(
+                contents, stream=True, generation_config=overrides or None
+            ):
+                stream.feed(chunk.text)
+            return stream.text
+
+        response = await self.model.generate_content_async(
+            contents, generation_config=overrides or None
+        )
+        return response.text
+
+    def _to_new_sdk_contents(self, contents: list) -> list:
+        """Convert old-SDK inline blobs / uploaded file handles into google-genai parts."""
+        converted = []
+        for c in contents:
+            if isinstance(c, dict) and "data" in c:
+                converted.append(types.Part.from_bytes(data=c["data"], mime_type=c["mime_type"]))
+            elif hasattr(c, "uri") and hasattr(c, "mime_type"):
+                converted.append(types.Part.from_uri(file_uri=c.uri, mime_type=c.mime_type))
+            else:
+                converted.append(c)
+        return converted
+
+    def _prepare_images(
+        self,
+        frames: list[tuple[float, np.ndarray]],
+        t0: float,
+        tr: float,
+    ) -> tuple[list, list]:
+        """
+        Select keyframes once and turn them into image contents for Gemini.
+
+        Returns:
+            Tuple of (image contents, uploaded files to delete afterwards).
+            Images are inline JPEG blobs, or Files API handles when upload_keyframes
+            is enabled (so both calls for a moment reuse a single upload).
+        """
+        keyframes = self.select_keyframes(frames, t0, tr)
+        jpegs = self._encode_keyframes(keyframes)
+
+        if self.upload_keyframes:
+            try:
+                uploaded = [
+                    genai.upload_file(
+                        path=io.BytesIO(data),
+                        mime_type="image/jpeg",
+                        display_name=f"keyframe_{ts:.2f}s",
+                    )
+                    for (ts, _), data in zip(keyframes, jpegs)
+                ]
+                return uploaded, uploaded
+            except Exception as e:
+                logger.warning(f"Keyframe upload failed, sending inline images: {e}")
+
+        return [{"mime_type": "image/jpeg", "data": data} for data in jpegs], []
+
+    def _encode_keyframes(self, keyframes: list[tuple[float, np.ndarray]]) -> list[bytes]:
+        """JPEG-encode keyframes, one per encode-pool thread when there are several."""
+        if len(keyframes) < 2:
+            return [self._frame_to_jpeg(frame) for _, frame in keyframes]
+        return list(_ENCODE_POOL.map(self._frame_to_jpeg, [frame for _, frame in keyframes]))
+
+    def _delete_uploads(self, uploaded: list):
+        """Delete keyframes uploaded through the Files API."""
+        for f in uploaded:
+            try:
+                genai.delete_file(f.name)
+            except Exception as e:
+                logger.debug(f"Could not delete uploaded keyframe {f.name}: {e}")
+
     def _extract_player_and_match_info(
         self,
         frames: list[tuple[float, np.ndarray]],
         t0: float,
         tr: float,
+        images: Optional[list] = None,
     ) -> tuple[Optional[PlayerInfo], Optional[MatchStats]]:
         """
         Phase 1 & 2: Visual analysis + search grounding to identify player and match stats.
 
+        Args:
+            images: Keyframe image contents already prepared for this moment
+                (selected from frames if not given)
+
         Returns:
             Tuple of (PlayerInfo, MatchStats) or (None, None) if extraction fails
         """
@@ -97,14 +655,18 @@ class GeminiAnalyzer:
 
         try:
             # Phase 1: Visual analysis to identify player/team from keyframes
-            keyframes = self._select_keyframes(frames, t0, tr)
-            pil_images = [self._numpy_to_pil(frame) for _, frame in keyframes]
+            if images is None:
+                keyframes = self.select_keyframes(frames, t0, tr)
+                images = [
+                    {"mime_type": "image/jpeg", "data": data}
+                    for data in self._encode_keyframes(keyframes)
+                ]
 
             phase1_prompt = build_player_identification_prompt()
 
             # Use old SDK for visual analysis (no search needed yet)
             logger.info("🔍 Phase 1: Visual player identification...")
-            phase1_response = self.model.generate_content([phase1_prompt] + pil_images)
+            phase1_response = self.model.generate_content([phase1_prompt] + images)
             phase1_text = phase1_response.text
 
             # Parse visual analysis
@@ -143,7 +705,7 @@ class GeminiAnalyzer:
     def _parse_visual_identification(self, response_text: str) -> Optional[dict]:
         """Parse Phase 1 visual identification response."""
         try:
-            data = json.loads(response_text)
+            data = _json_loads(response_text)
             return {
                 "jersey_number": data.get("jersey_number"),
                 "team_colors": data.get("team_colors"),
@@ -157,7 +719,7 @@ class GeminiAnalyzer:
     def _parse_search_response(self, response_text: str) -> tuple[Optional[PlayerInfo], Optional[MatchStats]]:
         """Parse Phase 2 search-grounded response."""
         try:
-            data = json.loads(response_text)
+            data = _json_loads(response_text)
 
             # Extract player info
             player_data = data.get("player_info", {})
@@ -194,6 +756,8 @@ class GeminiAnalyzer:
         motion_score: float,
         audio_rms: float,
         sport_type: str = "unknown",
+        service_tier: Optional[str] = None,
+        on_clip_segment: Optional[Callable[[ClipRecipe], None]] = None,
     ) -> MomentAnalysis:
         """
         Analyze a candidate moment using Gemini 3.
@@ -206,15 +770,129 @@ class GeminiAnalyzer:
             motion_score: Motion intensity (0-1)
             audio_rms: Audio RMS level (0-1)
             sport_type: Type of sport
+            service_tier: Optional Gemini service tier ("priority" for
+                user-facing calls, "flex" for bulk reprocessing); None uses
+                the account default
+            on_clip_segment: Optional callback; when given the response is
+                streamed and each clip_recipe segment is passed to it as soon
+                as it is generated (e.g. to start clip extraction early)
 
         Returns:
             MomentAnalysis with structured output
         """
         logger.info(f"🔍 Analyzing moment {candidate_id} (t0={t0:.2f}s, tr={tr:.2f}s)")
+        moment_id = self._moment_id(candidate_id)
+
+        # Prepare keyframes once - shared by player identification and analysis
+        images, uploaded = self._prepare_images(frames, t0, tr)
+
+        try:
+            # Extract player and match info first (if search grounding available)
+            player_info, match_stats = self._extract_player_and_match_info(
+                frames, t0, tr, images=images
+            )
+
+            contents = self._build_moment_contents(
+                candidate_id, t0, tr, images, motion_score, audio_rms, sport_type
+            )
+
+            # Call Gemini with multimodal input
+            result = self._generate(
+                contents, service_tier=service_tier, on_clip_segment=on_clip_segment
+            )
+            return self._finalize_moment(result, moment_id, t0, tr, player_info, match_stats)
+
+        except Exception as e:
+            logger.error(f"❌ Gemini analysis failed: {e}")
+            # Return a fallback moment
+            return self._create_fallback_moment(moment_id, t0, tr)
+
+        finally:
+            self._delete_uploads(uploaded)
+
+    async def analyze_moment_async(
+        self,
+        candidate_id: str,
+        t0: float,
+        tr: float,
+        frames: list[tuple[float, np.ndarray]],
+        motion_score: float,
+        audio_rms: float,
+        sport_type: str = "unknown",
+        service_tier: Optional[str] = None,
+        on_clip_segment: Optional[Callable[[ClipRecipe], None]] = None,
+    ) -> MomentAnalysis:
+        """
+        Async version of analyze_moment.
+
+        The Gemini round-trip is awaited on the SDK's async client, so several
+        analyses can be in flight at once (see analyze_moments_concurrent).
+        Search grounding, image conversion and uploads run on worker threads.
+        """
+        logger.info(f"🔍 Analyzing moment {candidate_id} (t0={t0:.2f}s, tr={tr:.2f}s)")
+        moment_id = self._moment_id(candidate_id)
 
-        # Extract player and match info first (if search grounding available)
-        player_info, match_stats = self._extract_player_and_match_info(frames, t0, tr)
+        # Prepare keyframes once - shared by player identification and analysis
+        images, uploaded = await asyncio.to_thread(self._prepare_images, frames, t0, tr)
 
+        try:
+            # Extract player and match info first (if search grounding available)
+            player_info, match_stats = await asyncio.to_thread(
+                self._extract_player_and_match_info, frames, t0, tr, images
+            )
+
+            contents = self._build_moment_contents(
+                candidate_id, t0, tr, images, motion_score, audio_rms, sport_type
+            )
+
+            result = await self._generate_async(
+                contents, service_tier=service_tier, on_clip_segment=on_clip_segment
+            )
+            return self._finalize_moment(result, moment_id, t0, tr, player_info, match_stats)
+
+        except Exception as e:
+            logger.error(f"❌ Gemini analysis failed: {e}")
+            return self._create_fallback_moment(moment_id, t0, tr)
+
+        finally:
+            if uploaded:
+                await asyncio.to_thread(self._delete_uploads, uploaded)
+
+    async def analyze_moments_concurrent(
+        self,
+        candidates: list[dict],
+        max_inflight: int = 8,
+    ) -> dict[str, MomentAnalysis]:
+        """
+        Analyze several candidates with overlapping Gemini calls.
+
+        Args:
+            candidates: List of dicts with the analyze_moment keyword arguments
+            max_inflight: Maximum number of concurrent Gemini requests
+
+        Returns:
+            Dict mapping candidate_id to MomentAnalysis
+        """
+        sem = asyncio.Semaphore(max_inflight)
+
+        async def _run(c: dict) -> MomentAnalysis:
+            async with sem:
+                return await self.analyze_moment_async(**c)
+
+        moments = await asyncio.gather(*(_run(c) for c in candidates))
+        return {c["candidate_id"]: m for c, m in zip(candidates, moments)}
+
+    def _build_moment_contents(
+        self,
+        candidate_id: str,
+        t0: float,
+        tr: float,
+        images: list,
+        motion_score: float,
+        audio_rms: float,
+        sport_type: str,
+    ) -> list:
+        """Build the prompt + keyframe image contents for a moment analysis call."""
         # Build prompt
         prompt = build_analysis_prompt(
             candidate_id=candidate_id,
@@ -225,45 +903,173 @@ class GeminiAnalyzer:
             sport_type=sport_type,
         )
 
-        # Prepare frames for Gemini (sample keyframes)
-        keyframes = self._select_keyframes(frames, t0, tr)
-        pil_images = [self._numpy_to_pil(frame) for _, frame in keyframes]
+        return [prompt] + images
 
-        try:
-            # Call Gemini with multimodal input
-            response = self.model.generate_content(
-                [prompt] + pil_images,
-            )
+    def _finalize_moment(
+        self,
+        result: str,
+        moment_id: str,
+        t0: float,
+        tr: float,
+        player_info: Optional[PlayerInfo],
+        match_stats: Optional[MatchStats],
+    ) -> MomentAnalysis:
+        """Parse a Gemini response into a MomentAnalysis and attach player/match info."""
+        logger.debug(f"Gemini response: {result}")
+
+        # Parse into MomentAnalysis
+        moment = self._parse_response(result, moment_id, t0, tr)
 
-            # Parse structured JSON response
-            result = response.text
-            logger.debug(f"Gemini response: {result}")
+        # Add player and match info
+        moment.player_info = player_info
+        moment.match_stats = match_stats
 
-            # Parse into MomentAnalysis
-            moment = self._parse_response(result, candidate_id, t0, tr)
+        logger.info(
+            f"✅ Moment analyzed: {moment.moment_type} "
+            f"(hype={moment.scores.hype}, risk={moment.scores.risk})"
+        )
+        if player_info:
+            logger.info(f"   Player: {player_info.name} ({player_info.team})")
+        if match_stats:
+            logger.info(f"   Match: {' vs '.join(match_stats.teams)} - {match_stats.score}")
+
+        return moment
+
+    def analyze_moments_batch(
+        self,
+        candidates: list[dict],
+        poll_interval: float = 10.0,
+        max_poll_interval: float = 120.0,
+        timeout: float = 24 * 3600.0,
+    ) -> dict[str, MomentAnalysis]:
+        """
+        Analyze many candidates in one Gemini Batch Mode job (offline pipelines).
+
+        Batch jobs are cheaper and have higher rate limits, but complete
+        asynchronously (minutes to hours), so this is only for VOD reprocessing.
+        Use analyze_moment for live, single-shot analysis. Player/match search
+        grounding is skipped in batch mode.
 
-            # Add player and match info
-            moment.player_info = player_info
-            moment.match_stats = match_stats
+        Args:
+            candidates: List of dicts with the analyze_moment keyword arguments
+                (candidate_id, t0, tr, frames, motion_score, audio_rms, and
+                optionally sport_type)
+            poll_interval: Initial seconds between job status checks
+            max_poll_interval: Upper bound for the exponential poll backoff
+            timeout: Give up waiting after this many seconds
+
+        Returns:
+            Dict mapping candidate_id to MomentAnalysis (fallback moments for
+            requests that failed)
+        """
+        if not candidates:
+            return {}
+
+        if not self.search_client:
+            logger.warning("google-genai SDK not available, analyzing batch sequentially")
+            return {c["candidate_id"]: self.analyze_moment(**c) for c in candidates}
+
+        by_id = {c["candidate_id"]: c for c in candidates}
+
+        # Build the JSONL request file: one keyed GenerateContentRequest per line
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", delete=False, encoding="utf-8"
+        ) as f:
+            jsonl_path = f.name
+            for c in candidates:
+                prompt = build_analysis_prompt(
+                    candidate_id=c["candidate_id"],
+                    t0=c["t0"],
+                    tr_estimate=c["tr"],
+                    motion_score=c["motion_score"],
+                    audio_rms=c["audio_rms"],
+                    sport_type=c.get("sport_type", "unknown"),
+                )
+                parts = [{"text": prompt}]
+                for _, frame in self.select_keyframes(c["frames"], c["t0"], c["tr"]):
+                    parts.append({
+                        "inline_data": {
+                            "mime_type": "image/jpeg",
+                            "data": base64.b64encode(self._frame_to_jpeg(frame)).decode("ascii"),
+                        }
+                    })
+                line = {
+                    "key": c["candidate_id"],
+                    "request": {
+                        "contents": [{"role": "user", "parts": parts}],
+                        "generation_config": self.generation_config,
+                    },
+                }
+                f.write(json.dumps(line) + "\n")
 
-            logger.info(
-                f"✅ Moment analyzed: {moment.moment_type} "
-                f"(hype={moment.scores.hype}, risk={moment.scores.risk})"
+        try:
+            uploaded = self.search_client.files.upload(
+                file=jsonl_path,
+                config=types.UploadFileConfig(display_name="vibe-check-batch", mime_type="jsonl"),
             )
-            if player_info:
-                logger.info(f"   Player: {player_info.name} ({player_info.team})")
-            if match_stats:
-                logger.info(f"   Match: {' vs '.join(match_stats.teams)} - {match_stats.score}")
+        finally:
+            os.unlink(jsonl_path)
 
-            return moment
+        job = self.search_client.batches.create(
+            model=self.model_name,
+            src=uploaded.name,
+            config={"display_name": "vibe-check-batch"},
+        )
+        logger.info(f"📦 Submitted batch job {job.name} with {len(candidates)} candidates")
+
+        # Poll with exponential backoff until the job reaches a terminal state
+        terminal_states = {
+            "JOB_STATE_SUCCEEDED",
+            "JOB_STATE_FAILED",
+            "JOB_STATE_CANCELLED",
+            "JOB_STATE_EXPIRED",
+            "JOB_STATE_PARTIALLY_SUCCEEDED",
+        }
+        deadline = time.monotonic() + timeout
+        delay = poll_interval
+        while job.state.name not in terminal_states:
+            if time.monotonic() >= deadline:
+                logger.error(f"❌ Batch job {job.name} timed out in state {job.state.name}")
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            job = self.search_client.batches.get(name=job.name)
+
+        results: dict[str, MomentAnalysis] = {}
+        if job.dest and job.dest.file_name:
+            content = self.search_client.files.download(file=job.dest.file_name)
+            for raw in content.decode("utf-8").splitlines():
+                if not raw.strip():
+                    continue
+                line = _json_loads(raw)
+                candidate_id = line.get("key")
+                c = by_id.get(candidate_id)
+                if c is None:
+                    continue
+                try:
+                    if "error" in line:
+                        raise ValueError(line["error"])
+                    text = line["response"]["candidates"][0]["content"]["parts"][0]["text"]
+                    results[candidate_id] = self._parse_response(
+                        text, self._moment_id(candidate_id), c["t0"], c["tr"]
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Batch analysis failed for {candidate_id}: {e}")
+        else:
+            logger.error(f"❌ Batch job {job.name} finished without results ({job.state.name})")
 
-        except Exception as e:
-            logger.error(f"❌ Gemini analysis failed: {e}")
-            # Return a fallback moment
-            return self._create_fallback_moment(candidate_id, t0, tr)
+        # Anything missing gets a fallback so callers always get one moment per candidate
+        for candidate_id, c in by_id.items():
+            if candidate_id not in results:
+                results[candidate_id] = self._create_fallback_moment(
+                    self._moment_id(candidate_id), c["t0"], c["tr"]
+                )
 
-    def _select_keyframes(
-        self,
+        logger.info(f"✅ Batch job {job.name} complete: {len(results)} moments")
+        return results
+
+    @staticmethod
+    def select_keyframes(
         frames: list[tuple[float, np.ndarray]],
         t0: float,
         tr: float,
@@ -275,27 +1081,40 @@ class GeminiAnalyzer:
         We want frames that show:
         1. The action (around t0)
         2. The reaction (around tr)
+
+        Frames must be in timestamp order (as ring buffer windows are).
+
+        The pipeline relies on two properties: the frame nearest t0 is always
+        selected, and selecting again from the returned frames returns the
+        same frames (so callers can snapshot just the selection).
         """
         if not frames:
             return []
 
-        keyframes = []
+        # Frames are time-ordered, so each nearest-timestamp lookup is a
+        # binary search rather than an argmin over every buffered frame
+        ts = np.fromiter((f[0] for f in frames), dtype=np.float64, count=len(frames))
+        targets = np.array([t0, tr, t0 - 2.0])
+        right = np.minimum(np.searchsorted(ts, targets), len(ts) - 1)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(targets - ts[left] <= ts[right] - targets, left, right).tolist()
 
         # Frame at t0 (play moment)
-        play_frame = min(frames, key=lambda f: abs(f[0] - t0))
-        keyframes.append(play_frame)
+        indices = [nearest[0]]
 
         # Frame at tr (reaction peak)
-        reaction_frame = min(frames, key=lambda f: abs(f[0] - tr))
-        if reaction_frame[0] != play_frame[0]:
-            keyframes.append(reaction_frame)
+        reaction_idx = nearest[1]
+        if reaction_idx not in indices:
+            indices.append(reaction_idx)
 
         # Add 1-2 more frames for context if we have room
-        if len(keyframes) < max_frames and len(frames) > 2:
+        if len(indices) < max_frames:
             # Frame slightly before t0
-            before_frame = min(frames, key=lambda f: abs(f[0] - (t0 - 2.0)))
-            if before_frame not in keyframes:
-                keyframes.insert(0, before_frame)
+            before_idx = nearest[2]
+            if before_idx not in indices:
+                indices.insert(0, before_idx)
+
+        keyframes = [frames[i] for i in indices]
 
         # Sort by timestamp
         keyframes.sort(key=lambda f: f[0])
@@ -303,114 +1122,108 @@ class GeminiAnalyzer:
         logger.debug(f"Selected {len(keyframes)} keyframes: {[f'{t:.2f}s' for t, _ in keyframes]}")
         return keyframes[:max_frames]
 
-    def _numpy_to_pil(self, frame: np.ndarray) -> Image.Image:
-        """Convert numpy array (OpenCV BGR) to PIL Image (RGB)."""
-        # OpenCV uses BGR, PIL uses RGB
-        if frame.shape[2] == 3:
-            frame_rgb = frame[:, :, ::-1]  # BGR to RGB
-        else:
-            frame_rgb = frame
+    def _downscale(self, frame: np.ndarray, max_dim: int = MAX_IMAGE_DIM) -> np.ndarray:
+        """Resize a frame so its longest edge is at most max_dim."""
+        h, w = frame.shape[:2]
+        scale = max_dim / max(h, w)
+        if scale >= 1.0:
+            return frame
+        return cv2.resize(
+            frame, (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
 
-        return Image.fromarray(frame_rgb)
+    def _frame_to_jpeg(
+        self,
+        frame: np.ndarray,
+        quality: int = JPEG_QUALITY,
+        max_dim: int = MAX_IMAGE_DIM,
+    ) -> bytes:
+        """Encode a numpy frame (OpenCV BGR) as JPEG bytes, downscaled to max_dim."""
+        frame = self._downscale(frame, max_dim)
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return buf.tobytes()
 
     def _repair_truncated_json(self, json_str: str) -> str:
         """Attempt to repair truncated JSON by closing open brackets/braces."""
-        # Count open brackets
-        open_braces = json_str.count('{') - json_str.count('}')
-        open_brackets = json_str.count('[') - json_str.count(']')
-
-        # Remove trailing incomplete content (after last complete value)
-        # Look for patterns like incomplete strings or trailing commas
-        import re
-
-        # Remove trailing incomplete string (unclosed quote)
-        if json_str.count('"') % 2 != 0:
-            # Find last complete key-value or array element
-            last_complete = max(
-                json_str.rfind('",'),
-                json_str.rfind('"},'),
-                json_str.rfind('],'),
-                json_str.rfind('},'),
-                json_str.rfind(': "'),
-            )
-            if last_complete > 0:
-                # Try to find a good truncation point
-                for end_pattern in ['",', '"},', '],', '},', '}', ']']:
-                    pos = json_str.rfind(end_pattern)
-                    if pos > 0:
-                        json_str = json_str[:pos + len(end_pattern)]
-                        break
-
-        # Remove trailing comma if present
-        json_str = re.sub(r',\s*$', '', json_str.strip())
+        data = json_str.strip().encode("utf-8")
+        if not data:
+            return json_str
 
-        # Recount after cleanup
-        open_braces = json_str.count('{') - json_str.count('}')
-        open_brackets = json_str.count('[') - json_str.count(']')
+        # One pass finds the last safe cut point and the closers still pending
+        buf = np.frombuffer(data, dtype=np.uint8) if HAS_NUMBA else data
+        cut, depth, stack = _scan_json(buf)
 
-        # Close open brackets and braces
-        json_str += ']' * open_brackets
-        json_str += '}' * open_braces
+        # Cut points sit on ASCII structural characters, so decoding is safe
+        repaired = data[:cut].decode("utf-8").rstrip()
+        return repaired + bytes(stack[:depth][::-1]).decode("ascii")
 
-        return json_str
+    @staticmethod
+    def _moment_id(candidate_id: str) -> str:
+        """Map a candidate ID (c_0001) to its moment ID (m_0001)."""
+        return f"m_{candidate_id.split('_', 1)[1]}"
 
     def _parse_response(
         self,
         response_text: str,
-        candidate_id: str,
+        moment_id: str,
         t0: float,
         tr: float,
     ) -> MomentAnalysis:
         """Parse Gemini JSON response into MomentAnalysis with robust error handling."""
-        import json
-        import re
-
-        # Clean response text - remove comments and trailing commas
-        cleaned_text = response_text
-        cleaned_text = re.sub(r'//.*?\n|/\*.*?\*/', '', cleaned_text, flags=re.DOTALL)  # Remove comments
-        cleaned_text = re.sub(r',(\s*[}\]])', r'\1', cleaned_text)  # Remove trailing commas
-
         data = None
+        cleaned_text = response_text
 
-        # Try 1: Parse JSON directly
+        # Try 1: Parse JSON directly (response_mime_type is JSON, so this
+        # is the common case and needs no cleanup)
         try:
-            data = json.loads(cleaned_text)
+            data = _json_loads(response_text)
         except json.JSONDecodeError as e:
             logger.warning(f"JSON parse error: {e}. Attempting cleanup...")
 
+            # Clean response text - remove comments and trailing commas
+            cleaned_text = _COMMENT_RE.sub('', cleaned_text)  # Remove comments
+            cleaned_text = _TRAILING_COMMA_RE.sub(r'\1', cleaned_text)  # Remove trailing commas
+            try:
+                data = _json_loads(cleaned_text)
+            except json.JSONDecodeError:
+                pass
+
         # Try 2: Extract from markdown code blocks
         if data is None:
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', cleaned_text, re.DOTALL)
+            json_match = _MD_JSON_RE.search(cleaned_text)
             if json_match:
                 try:
                     extracted = json_match.group(1)
-                    extracted = re.sub(r',(\s*[}\]])', r'\1', extracted)
-                    data = json.loads(extracted)
+                    extracted = _TRAILING_COMMA_RE.sub(r'\1', extracted)
+                    data = _json_loads(extracted)
                     logger.info("Successfully extracted JSON from code block")
                 except Exception:
                     pass
 
         # Try 3: Find JSON object in response
         if data is None:
-            json_match = re.search(r'\{.*', cleaned_text, re.DOTALL)
+            json_match = _JSON_OBJ_RE.search(cleaned_text)
             if json_match:
                 try:
                     extracted = json_match.group(0)
-                    extracted = re.sub(r',(\s*[}\]])', r'\1', extracted)
-                    data = json.loads(extracted)
+                    extracted = _TRAILING_COMMA_RE.sub(r'\1', extracted)
+                    data = _json_loads(extracted)
                     logger.info("Successfully extracted JSON object")
                 except Exception:
                     pass
 
         # Try 4: Repair truncated JSON
         if data is None:
-            json_match = re.search(r'\{.*', cleaned_text, re.DOTALL)
+            json_match = _JSON_OBJ_RE.search(cleaned_text)
             if json_match:
                 try:
                     extracted = json_match.group(0)
                     repaired = self._repair_truncated_json(extracted)
-                    repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
-                    data = json.loads(repaired)
+                    repaired = _TRAILING_COMMA_RE.sub(r'\1', repaired)
+                    data = _json_loads(repaired)
                     logger.info("Successfully repaired and parsed truncated JSON")
                 except Exception as ex:
                     logger.error(f"Failed to repair JSON: {ex}")
@@ -423,16 +1236,13 @@ class GeminiAnalyzer:
             logger.error(f"Response text: {response_text[:500]}...")
             raise ValueError("Could not parse Gemini response as JSON")
 
-        # Generate moment ID
-        moment_id = f"m_{candidate_id.split('_')[1]}"
-
         # Safely extract moment_type with validation
         moment_type_str = data.get("moment_type", "other").lower()
         # Handle invalid moment types
-        valid_types = [t.value for t in MomentType]
-        if moment_type_str not in valid_types:
+        moment_type = _MOMENT_TYPES.get(moment_type_str)
+        if moment_type is None:
             logger.warning(f"Invalid moment_type '{moment_type_str}', using 'other'")
-            moment_type_str = "other"
+            moment_type = MomentType.OTHER
 
         # Safely extract scores
         scores_data = data.get("scores", {})
@@ -456,11 +1266,15 @@ class GeminiAnalyzer:
         clip_recipe_data = data.get("clip_recipe", [])
         clip_recipe = []
         if isinstance(clip_recipe_data, list):
-            for seg in clip_recipe_data:
-                try:
-                    clip_recipe.append(ClipRecipe(**seg))
-                except Exception as e:
-                    logger.warning(f"Failed to parse clip segment: {e}")
+            try:
+                clip_recipe = CLIP_RECIPE_ADAPTER.validate_python(clip_recipe_data)
+            except ValidationError:
+                # Keep the valid segments when some are malformed
+                for seg in clip_recipe_data:
+                    try:
+                        clip_recipe.append(ClipRecipe(**seg))
+                    except Exception as e:
+                        logger.warning(f"Failed to parse clip segment: {e}")
 
         # Safely extract post_copy
         post_copy_data = data.get("post_copy", {})
@@ -481,7 +1295,7 @@ class GeminiAnalyzer:
             moment_id=moment_id,
             t0=t0,
             tr=tr,
-            moment_type=MomentType(moment_type_str),
+            moment_type=moment_type,
             summary=data.get("summary", "Moment detected"),
             why_it_matters=why_it_matters,
             scores=MomentScores(hype=hype, risk=risk),
@@ -492,13 +1306,11 @@ class GeminiAnalyzer:
 
     def _create_fallback_moment(
         self,
-        candidate_id: str,
+        moment_id: str,
         t0: float,
         tr: float,
     ) -> MomentAnalysis:
         """Create a fallback moment when Gemini fails."""
-        moment_id = f"m_{candidate_id.split('_')[1]}"
-
         return MomentAnalysis(
             moment_id=moment_id,
             t0=t0,
@@ -526,24 +1338,33 @@ class GeminiAnalyzer:
         video_path: str,
         motion_score: float,
         audio_rms: float,
+        service_tier: Optional[str] = None,
     ) -> MomentAnalysis:
         """
         Alternative method: Upload video file to Gemini for analysis.
 
         This is useful for longer clips where we want Gemini to see
         the full video context rather than just keyframes.
+        service_tier is forwarded as in analyze_moment.
         """
         logger.info(f"📹 Uploading video for analysis: {video_path}")
+        moment_id = self._moment_id(candidate_id)
 
         try:
             # Upload video file to Gemini
             video_file = genai.upload_file(path=video_path)
             logger.info(f"✅ Video uploaded: {video_file.uri}")
 
-            # Wait for processing
-            import time
+            # Wait for processing (exponential backoff, capped)
+            deadline = time.monotonic() + VIDEO_PROCESSING_TIMEOUT
+            delay = 0.5
             while video_file.state.name == "PROCESSING":
-                time.sleep(1)
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"Video still processing after {VIDEO_PROCESSING_TIMEOUT:.0f}s"
+                    )
+                time.sleep(delay)
+                delay = min(delay * 1.5, 8.0)
                 video_file = genai.get_file(video_file.name)
 
             if video_file.state.name == "FAILED":
@@ -559,12 +1380,14 @@ class GeminiAnalyzer:
             )
 
             # Analyze with video
-            response = self.model.generate_content(
+            result = self._generate(
                 [prompt, video_file],
+                service_tier=service_tier,
+                max_output_tokens=VIDEO_MAX_OUTPUT_TOKENS,
             )
 
             # Parse response
-            moment = self._parse_response(response.text, candidate_id, t0, tr)
+            moment = self._parse_response(result, moment_id, t0, tr)
 
             # Clean up uploaded file
             genai.delete_file(video_file.name)
@@ -573,4 +1396,4 @@ class GeminiAnalyzer:
 
         except Exception as e:
             logger.error(f"❌ Video analysis failed: {e}")
-            return self._create_fallback_moment(candidate_id, t0, tr)
+            return self._create_fallback_moment(moment_id, t0, tr)
@@ -68,6 +68,14 @@ Be decisive and confident. This is time-sensitive content.
 """
 
 
+# The static template is joined once; only the per-moment context is formatted
+_ANALYSIS_PROMPT_PREFIX = f"""
+{MOMENT_ANALYSIS_PROMPT}
+
+**Moment Context:**
+"""
+
+
 def build_analysis_prompt(
     candidate_id: str,
     t0: float,
@@ -90,11 +98,7 @@ def build_analysis_prompt(
     Returns:
         Formatted prompt string
     """
-    return f"""
-{MOMENT_ANALYSIS_PROMPT}
-
-**Moment Context:**
-- Candidate ID: {candidate_id}
+    return _ANALYSIS_PROMPT_PREFIX + f"""- Candidate ID: {candidate_id}
 - Play timestamp (t0): {t0:.2f}s
 - Estimated reaction peak (tr): {tr_estimate:.2f}s
 - Motion intensity: {motion_score:.2f} (0=low, 1=high)
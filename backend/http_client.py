@@ -0,0 +1,31 @@
+"""Shared aiohttp session for outbound HTTP (player photos, generated cards)."""
+
+from typing import Optional
+
+import aiohttp
+
+# Created lazily on first use, so it binds to the running event loop
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        # Pooled connections are reused across requests (no TCP/TLS handshake
+        # per download); limit_per_host keeps one CDN from taking every slot
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=15, connect=5),
+            connector=aiohttp.TCPConnector(
+                limit=100, limit_per_host=10, enable_cleanup_closed=True
+            ),
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared HTTP session if it is open."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -1,9 +1,76 @@
 """Ring buffer for storing recent video frames and features."""
 
-from collections import deque
-from typing import Any, Tuple
+from typing import Any, Iterator, Optional, Tuple
 import numpy as np
 
+# Extra frame slab slots beyond the buffered duration, so frames being decoded
+# ahead of the one being processed never overwrite a frame still in the ring
+SPARE_FRAME_SLOTS = 8
+
+
+class _TimeRing:
+    """
+    Fixed-capacity ring of (timestamp, value) entries stored as SoA.
+
+    Timestamps live in a float64 array next to a parallel list of values, so
+    window lookups are binary searches instead of a scan. Timestamps must be
+    pushed in non-decreasing order (true for frames read from a video).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._values: list[Any] = [None] * capacity
+        self._head = 0  # Index of the oldest entry
+        self._count = 0
+
+    def push(self, timestamp: float, value: Any):
+        if self._count < self.capacity:
+            idx = (self._head + self._count) % self.capacity
+            self._count += 1
+        else:
+            # Full - overwrite the oldest entry
+            idx = self._head
+            self._head = (self._head + 1) % self.capacity
+        self._ts[idx] = timestamp
+        self._values[idx] = value
+
+    def _segments(self) -> list[Tuple[int, int]]:
+        """Physical [start, stop) index ranges holding the entries, oldest first."""
+        end = self._head + self._count
+        if end <= self.capacity:
+            return [(self._head, end)]
+        return [(self._head, self.capacity), (0, end - self.capacity)]
+
+    def window(self, start_time: float, end_time: float) -> list[Tuple[float, Any]]:
+        """Entries with start_time <= timestamp <= end_time, oldest first."""
+        out: list[Tuple[float, Any]] = []
+        for seg_start, seg_stop in self._segments():
+            ts = self._ts[seg_start:seg_stop]
+            lo = seg_start + int(np.searchsorted(ts, start_time, side="left"))
+            hi = seg_start + int(np.searchsorted(ts, end_time, side="right"))
+            if lo < hi:
+                out.extend(zip(self._ts[lo:hi].tolist(), self._values[lo:hi]))
+        return out
+
+    def latest(self) -> Tuple[float, Any] | None:
+        if not self._count:
+            return None
+        idx = (self._head + self._count - 1) % self.capacity
+        return float(self._ts[idx]), self._values[idx]
+
+    def clear(self):
+        self._values = [None] * self.capacity
+        self._head = 0
+        self._count = 0
+
+    def __iter__(self) -> Iterator[Tuple[float, Any]]:
+        for seg_start, seg_stop in self._segments():
+            yield from zip(self._ts[seg_start:seg_stop].tolist(), self._values[seg_start:seg_stop])
+
+    def __len__(self) -> int:
+        return self._count
+
 
 class RingBuffer:
     """
@@ -15,29 +82,75 @@ class RingBuffer:
     - Slack for late decisions
     """
 
-    def __init__(self, duration_seconds: float = 70.0, fps: float = 30.0):
+    def __init__(
+        self,
+        duration_seconds: float = 70.0,
+        fps: float = 30.0,
+        frame_shape: Optional[Tuple[int, ...]] = None,
+    ):
         """
         Initialize ring buffer.
 
+        Frames are stored in one preallocated uint8 slab rather than as
+        separate heap arrays. The slab is allocated on the first frame (or
+        up front when frame_shape is known) and reallocated if the frame
+        shape changes.
+
         Args:
             duration_seconds: How many seconds of video to buffer
             fps: Frames per second (used to calculate buffer size)
+            frame_shape: Optional (H, W, 3) to allocate the frame slab eagerly
         """
         self.duration_seconds = duration_seconds
         self.fps = fps
         self.max_size = int(duration_seconds * fps)
 
-        # Deques for different data types
-        self.frames: deque[Tuple[float, np.ndarray]] = deque(maxlen=self.max_size)
-        self.features: deque[Tuple[float, dict]] = deque(maxlen=self.max_size)
+        # Separate rings for different data types (timestamps + values)
+        self.frames = _TimeRing(self.max_size)
+        self.features = _TimeRing(self.max_size)
 
-    def push_frame(self, timestamp: float, frame: np.ndarray):
-        """Add a frame to the buffer."""
-        self.frames.append((timestamp, frame))
+        self._frame_slab: Optional[np.ndarray] = None
+        self._slot_idx = 0
+        if frame_shape is not None:
+            self._alloc_slab(frame_shape)
+
+    def _alloc_slab(self, frame_shape: Tuple[int, ...]):
+        # np.empty only reserves address space; pages are committed as frames land
+        self._frame_slab = np.empty(
+            (self.max_size + SPARE_FRAME_SLOTS,) + tuple(frame_shape), dtype=np.uint8
+        )
+        self._slot_idx = 0
+
+    def reserve_frame_slot(self, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Return the next slab slot for a frame of frame_shape.
+
+        Decoders can read straight into the slot (e.g. cv2 cap.read(slot)) and
+        pass it to push_frame, which then stores it without a copy. Slots are
+        handed out round-robin, so up to SPARE_FRAME_SLOTS frames may be
+        reserved ahead of the last pushed one.
+        """
+        if self._frame_slab is None or self._frame_slab.shape[1:] != tuple(frame_shape):
+            self._alloc_slab(frame_shape)
+        slot = self._frame_slab[self._slot_idx]
+        self._slot_idx = (self._slot_idx + 1) % len(self._frame_slab)
+        return slot
 
-    def push_features(self, timestamp: float, features: dict):
+    def push_frame(self, timestamp: float, frame: np.ndarray):
+        """Add a frame to the buffer (copied into the slab unless it is a reserved slot)."""
+        if frame.dtype != np.uint8:
+            # Non-uint8 frames don't fit the slab; keep a reference as before
+            self.frames.push(timestamp, frame)
+            return
+        if self._frame_slab is None or not np.may_share_memory(frame, self._frame_slab):
+            slot = self.reserve_frame_slot(frame.shape)
+            np.copyto(slot, frame)
+            frame = slot
+        self.frames.push(timestamp, frame)
+
+    def push_features(self, timestamp: float, features: Any):
         """Add extracted features for a timestamp."""
-        self.features.append((timestamp, features))
+        self.features.push(timestamp, features)
 
     def get_frames_in_window(
         self, start_time: float, end_time: float
@@ -45,32 +158,27 @@ class RingBuffer:
         """
         Get all frames in a time window [start_time, end_time].
 
+        Frames are views into the slab and stay valid until the buffer wraps
+        around (duration_seconds later); copy any frame kept longer.
+
         Returns:
             List of (timestamp, frame) tuples
         """
-        return [
-            (ts, frame)
-            for ts, frame in self.frames
-            if start_time <= ts <= end_time
-        ]
+        return self.frames.window(start_time, end_time)
 
     def get_features_in_window(
         self, start_time: float, end_time: float
-    ) -> list[Tuple[float, dict]]:
+    ) -> list[Tuple[float, Any]]:
         """Get all features in a time window."""
-        return [
-            (ts, feats)
-            for ts, feats in self.features
-            if start_time <= ts <= end_time
-        ]
+        return self.features.window(start_time, end_time)
 
     def get_latest_frame(self) -> Tuple[float, np.ndarray] | None:
         """Get the most recent frame."""
-        return self.frames[-1] if self.frames else None
+        return self.frames.latest()
 
-    def get_latest_features(self) -> Tuple[float, dict] | None:
+    def get_latest_features(self) -> Tuple[float, Any] | None:
         """Get the most recent features."""
-        return self.features[-1] if self.features else None
+        return self.features.latest()
 
     def clear(self):
         """Clear the buffer."""
@@ -4,13 +4,37 @@ import cv2
 import numpy as np
 from pathlib import Path
 import time
-from typing import Iterator, Tuple, Optional
+from typing import Callable, Iterator, Tuple, Optional
 import logging
 import ffmpeg
 import subprocess
 
+# PyAV is optional - decodes audio in-process; falls back to the ffmpeg CLI
+try:
+    import av
+    HAS_PYAV = True
+except ImportError:
+    HAS_PYAV = False
+
 logger = logging.getLogger(__name__)
 
+# Sample rate audio is decoded/resampled to (mono)
+AUDIO_SAMPLE_RATE = 44100
+
+# int16 PCM -> [-1.0, 1.0) float32 scale
+_PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+# Audio samples per RMS window (the window extract_audio_rms uses by default)
+RMS_WINDOW_SIZE = 1024
+
+# Frames per chunk when precomputing the RMS table (bounds the gathered
+# window matrix to ~16 MB of float32)
+_RMS_CHUNK_FRAMES = 4096
+
+# Forward seeks up to this far grab() through frames instead of a container
+# seek, which would jump back to the previous keyframe and re-decode from there
+FORWARD_GRAB_SECONDS = 1.0
+
 
 class VideoIngester:
     """
@@ -20,7 +44,13 @@ class VideoIngester:
     at their native frame rate.
     """
 
-    def __init__(self, video_path: str, stream_id: str, realtime_mode: bool = True):
+    def __init__(
+        self,
+        video_path: str,
+        stream_id: str,
+        realtime_mode: bool = True,
+        hw_decode: bool = True,
+    ):
         """
         Initialize video ingester.
 
@@ -28,6 +58,8 @@ class VideoIngester:
             video_path: Path to MP4 file
             stream_id: Unique identifier for this video stream
             realtime_mode: If True, simulate realtime playback with delays
+            hw_decode: Try hardware video decode (NVDEC/VA-API/D3D11 via
+                FFmpeg); falls back to software decode when unavailable
         """
         self.video_path = Path(video_path)
         self.stream_id = stream_id
@@ -37,7 +69,7 @@ class VideoIngester:
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
         # Open video capture
-        self.cap = cv2.VideoCapture(str(self.video_path))
+        self.cap = self._open_capture(hw_decode)
         if not self.cap.isOpened():
             raise ValueError(f"Could not open video: {video_path}")
 
@@ -47,6 +79,13 @@ class VideoIngester:
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.duration_seconds = self.total_frames / self.fps if self.fps > 0 else 0
+        fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+        self.hw_accelerated = (
+            self.cap.get(cv2.CAP_PROP_HW_ACCELERATION) != cv2.VIDEO_ACCELERATION_NONE
+        )
+        # Frame period, so per-frame timestamps are a multiply rather than a divide
+        self._inv_fps = 1.0 / self.fps if self.fps > 0 else 0.033  # fallback to ~30fps
 
         self.current_frame_idx = 0
         self.start_time = None
@@ -56,46 +95,137 @@ class VideoIngester:
         self.audio_sample_rate: Optional[int] = None
         self._extract_audio_stream()
 
+        # Per-frame RMS envelope, computed once so the ingest loop only indexes it
+        self._rms_table: Optional[np.ndarray] = self._build_rms_table(RMS_WINDOW_SIZE)
+
         logger.info(
             f"📹 Opened video: {self.video_path.name} "
             f"({self.width}x{self.height}, {self.fps:.2f} fps, "
             f"{self.duration_seconds:.2f}s, {self.total_frames} frames)"
         )
 
-    def ingest_frames(self) -> Iterator[Tuple[float, np.ndarray]]:
+    def _open_capture(self, hw_decode: bool) -> cv2.VideoCapture:
+        """Open the video, preferring any available hardware decoder."""
+        if hw_decode:
+            # Frames are still downloaded to host BGR, so callers see no difference
+            cap = cv2.VideoCapture(
+                str(self.video_path),
+                cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+            if cap.isOpened():
+                if cap.get(cv2.CAP_PROP_HW_ACCELERATION) != cv2.VIDEO_ACCELERATION_NONE:
+                    logger.info(f"🚀 Hardware video decode enabled for {self.video_path.name}")
+                return cap
+            cap.release()
+        return cv2.VideoCapture(str(self.video_path))
+
+    def ingest_frames(
+        self,
+        frame_buffer: Optional[Callable[[Tuple[int, int, int]], np.ndarray]] = None,
+    ) -> Iterator[Tuple[float, np.ndarray]]:
         """
         Yield frames from the video with timestamps.
 
+        Args:
+            frame_buffer: Optional callable returning a preallocated (H, W, 3)
+                uint8 array to decode each frame into (e.g.
+                RingBuffer.reserve_frame_slot), avoiding a fresh allocation
+                per frame
+
         Yields:
             Tuple of (timestamp_seconds, frame_array)
         """
-        self.start_time = time.time()
-        frame_duration = 1.0 / self.fps if self.fps > 0 else 0.033  # fallback to ~30fps
+        self.start_time = time.monotonic()
+        inv_fps = self._inv_fps
+        frame_shape = (self.height, self.width, 3)
+
+        # Realtime pacing deadline. Monotonic and relative to the first frame
+        # yielded, so wall-clock jumps or a prior seek() don't stall playback.
+        next_deadline = time.monotonic()
 
         while True:
-            ret, frame = self.cap.read()
+            if frame_buffer is not None:
+                ret, frame = self.cap.read(frame_buffer(frame_shape))
+            else:
+                ret, frame = self.cap.read()
             if not ret:
                 logger.info(f"✅ Video ingestion complete: {self.stream_id}")
                 break
 
-            # Calculate timestamp from frame index
-            timestamp = self.current_frame_idx / self.fps
+            # Calculate timestamp from frame index (idx * period rather than a
+            # running sum, which would drift over a multi-hour stream)
+            timestamp = self.current_frame_idx * inv_fps
 
-            # Simulate realtime playback
+            # Simulate realtime playback (file/batch processing passes
+            # realtime_mode=False and decodes as fast as possible)
             if self.realtime_mode:
-                elapsed = time.time() - self.start_time
-                target_time = timestamp
-                if elapsed < target_time:
-                    time.sleep(target_time - elapsed)
+                remaining = next_deadline - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                next_deadline += inv_fps
 
             yield timestamp, frame
             self.current_frame_idx += 1
 
+    def ingest_motion_vectors(self) -> Iterator[Tuple[float, Optional[np.ndarray]]]:
+        """
+        Yield the codec's motion vectors per frame instead of decoded pixels.
+
+        Motion-only fast path for FeatureExtractor.extract_motion_features:
+        frames are decoded by PyAV with motion vector export and never
+        converted to BGR. Timestamps, realtime pacing and current_frame_idx
+        (hence extract_audio_rms) behave as in ingest_frames.
+
+        Yields:
+            Tuple of (timestamp_seconds, motion_vectors), where motion_vectors
+            is a MOTION_VECTOR_DTYPE structured array, or None for frames
+            without vectors (intra-coded)
+        """
+        if not HAS_PYAV:
+            raise RuntimeError("Motion vector ingestion requires PyAV")
+
+        self.start_time = time.monotonic()
+        inv_fps = self._inv_fps
+        next_deadline = time.monotonic()
+
+        with av.open(str(self.video_path)) as container:
+            stream = container.streams.video[0]
+            stream.codec_context.options = {"flags2": "+export_mvs"}
+            stream.thread_type = "AUTO"
+            mv_type = av.sidedata.sidedata.Type.MOTION_VECTORS
+
+            for frame in container.decode(stream):
+                side_data = frame.side_data.get(mv_type)
+                motion_vectors = side_data.to_ndarray() if side_data is not None else None
+
+                timestamp = self.current_frame_idx * inv_fps
+
+                if self.realtime_mode:
+                    remaining = next_deadline - time.monotonic()
+                    if remaining > 0:
+                        time.sleep(remaining)
+                    next_deadline += inv_fps
+
+                yield timestamp, motion_vectors
+                self.current_frame_idx += 1
+
+        logger.info(f"✅ Motion vector ingestion complete: {self.stream_id}")
+
     def _extract_audio_stream(self):
         """
-        Extract full audio stream from video file using ffmpeg.
+        Extract full audio stream from video file.
         Called once during initialization to cache audio data.
+
+        Uses PyAV (in-process decode) when available, otherwise the ffmpeg CLI.
         """
+        if HAS_PYAV:
+            try:
+                self._extract_audio_pyav()
+                return
+            except Exception as e:
+                logger.warning(f"⚠️  PyAV audio decode failed, falling back to ffmpeg: {e}")
+
         try:
             # Probe video to check if it has audio
             probe = ffmpeg.probe(str(self.video_path))
@@ -109,7 +239,7 @@ class VideoIngester:
 
             # Extract audio as raw PCM samples
             # Output: mono, 16-bit signed integers, 44100 Hz
-            self.audio_sample_rate = 44100
+            self.audio_sample_rate = AUDIO_SAMPLE_RATE
 
             out, err = (
                 ffmpeg
@@ -119,11 +249,8 @@ class VideoIngester:
                 .run(capture_stdout=True, capture_stderr=True, quiet=True)
             )
 
-            # Convert bytes to numpy array
-            audio_data = np.frombuffer(out, np.int16)
-
-            # Normalize to -1.0 to 1.0 range
-            self.audio_samples = audio_data.astype(np.float32) / 32768.0
+            # Normalize to -1.0 to 1.0 range (single fused int16 -> float32 pass)
+            self.audio_samples = np.multiply(np.frombuffer(out, np.int16), _PCM16_SCALE)
 
             logger.info(
                 f"🔊 Extracted audio: {len(self.audio_samples)} samples "
@@ -140,7 +267,80 @@ class VideoIngester:
             self.audio_samples = None
             self.audio_sample_rate = None
 
-    def extract_audio_rms(self, window_size: int = 1024) -> float:
+    def _extract_audio_pyav(self):
+        """Decode + resample the audio track in-process straight into a float32 buffer."""
+        with av.open(str(self.video_path)) as container:
+            if not container.streams.audio:
+                logger.warning(f"⚠️  No audio stream found in {self.video_path.name}")
+                self.audio_samples = None
+                self.audio_sample_rate = None
+                return
+
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=AUDIO_SAMPLE_RATE)
+
+            # Preallocate from the container's duration estimate (grown if short)
+            if stream.duration is not None and stream.time_base is not None:
+                duration = float(stream.duration * stream.time_base)
+            else:
+                duration = (container.duration or 0) / av.time_base
+            samples = np.empty(int(duration * AUDIO_SAMPLE_RATE) + AUDIO_SAMPLE_RATE, np.float32)
+            pos = 0
+
+            def append(frames):
+                nonlocal samples, pos
+                for frame in frames:
+                    pcm = frame.to_ndarray().reshape(-1)
+                    end = pos + len(pcm)
+                    if end > len(samples):
+                        grown = np.empty(max(end, 2 * len(samples)), np.float32)
+                        grown[:pos] = samples[:pos]
+                        samples = grown
+                    # Fused int16 -> float32 cast + normalize into the target slice
+                    np.multiply(pcm, _PCM16_SCALE, out=samples[pos:end])
+                    pos = end
+
+            for frame in container.decode(stream):
+                append(resampler.resample(frame))
+            append(resampler.resample(None))  # Flush buffered samples
+
+        self.audio_sample_rate = AUDIO_SAMPLE_RATE
+        self.audio_samples = samples[:pos]
+
+        logger.info(
+            f"🔊 Extracted audio: {len(self.audio_samples)} samples "
+            f"at {self.audio_sample_rate} Hz "
+            f"({len(self.audio_samples) / self.audio_sample_rate:.2f}s)"
+        )
+
+    def _build_rms_table(self, window_size: int) -> Optional[np.ndarray]:
+        """
+        Precompute the normalized audio RMS for every frame in one vectorized pass.
+
+        Matches extract_audio_rms: frames whose window runs past the end of the
+        audio are left to the per-call path (NaN in the table).
+        """
+        if self.audio_samples is None or self.audio_sample_rate is None:
+            return None
+        if self.fps <= 0 or self.total_frames <= 0 or len(self.audio_samples) < window_size:
+            return None
+
+        table = np.full(self.total_frames, np.nan, dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(self.audio_samples, window_size)
+        # Same window placement as extract_audio_rms: centered on each frame
+        centers = (np.arange(self.total_frames) / self.fps * self.audio_sample_rate).astype(np.int64)
+        starts = np.maximum(centers - window_size // 2, 0)
+        full = np.flatnonzero(starts < len(windows))
+
+        for i in range(0, len(full), _RMS_CHUNK_FRAMES):
+            idx = full[i:i + _RMS_CHUNK_FRAMES]
+            w = windows[starts[idx]]
+            sum_sq = np.einsum("ij,ij->i", w, w)
+            table[idx] = np.minimum(np.sqrt(sum_sq / window_size) * 3.0, 1.0)
+
+        return table
+
+    def extract_audio_rms(self, window_size: int = RMS_WINDOW_SIZE) -> float:
         """
         Extract audio RMS for the current frame window.
 
@@ -154,8 +354,18 @@ class VideoIngester:
             # No audio available, return neutral value
             return 0.5
 
+        # Fast path: precomputed envelope
+        if (
+            window_size == RMS_WINDOW_SIZE
+            and self._rms_table is not None
+            and self.current_frame_idx < len(self._rms_table)
+        ):
+            rms = self._rms_table[self.current_frame_idx]
+            if not np.isnan(rms):
+                return float(rms)
+
         # Calculate which audio samples correspond to current frame
-        timestamp = self.current_frame_idx / self.fps
+        timestamp = self.current_frame_idx * self._inv_fps
 
         # Center the window around the current timestamp
         center_sample = int(timestamp * self.audio_sample_rate)
@@ -188,12 +398,26 @@ class VideoIngester:
             "height": self.height,
             "duration_seconds": self.duration_seconds,
             "total_frames": self.total_frames,
+            "codec": self.codec,
+            "hw_accelerated": self.hw_accelerated,
         }
 
     def seek(self, timestamp: float):
-        """Seek to a specific timestamp in seconds."""
+        """
+        Seek to a specific timestamp in seconds.
+
+        Pre-roll for clips should come from the RingBuffer rather than seeking
+        backwards here; short forward hops are cheap (grab() without BGR
+        conversion), anything else is a keyframe seek plus re-decode.
+        """
         frame_number = int(timestamp * self.fps)
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        skip = frame_number - self.current_frame_idx
+        if 0 <= skip <= FORWARD_GRAB_SECONDS * self.fps:
+            for _ in range(skip):
+                if not self.cap.grab():
+                    break
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
         self.current_frame_idx = frame_number
         logger.debug(f"⏩ Seeked to {timestamp:.2f}s (frame {frame_number})")
 
@@ -1,23 +1,34 @@
 """FastAPI main application - Vibe Check backend."""
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, FileResponse, Response
 from contextlib import asynccontextmanager
 import os
 import shutil
+import asyncio
+import time
+import uuid
+import mimetypes
+import orjson
 from dotenv import load_dotenv
 
 from models import (
     MomentAnalysis,
+    MomentType,
+    MomentScores,
+    PostCopy,
     CandidateEvent,
     ApprovalEvent,
     VideoIngestRequest,
+    ShareCardBatchRequest,
 )
 from pipeline import VideoPipeline
+from stores import LRUDict, MomentStore, MAX_STORED_CANDIDATES
+from http_client import close_session
 from typing import Optional
 
-# Load environment variables
+# Load environment variables (before STORAGE_PATHS reads them)
 load_dotenv()
 
 # Storage paths
@@ -28,16 +39,16 @@ STORAGE_PATHS = {
     "share_cards": "./storage/share_cards",
 }
 
-# Create storage directories
-for path in STORAGE_PATHS.values():
-    os.makedirs(path, exist_ok=True)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     global pipeline
     print("🚀 Vibe Check backend starting up...")
+
+    # Create storage directories at startup, not on every import
+    for path in STORAGE_PATHS.values():
+        os.makedirs(path, exist_ok=True)
     print(f"📁 Storage paths: {STORAGE_PATHS}")
 
     # Initialize pipeline with audio-optimized thresholds
@@ -45,6 +56,7 @@ async def lifespan(app: FastAPI):
         pipeline = VideoPipeline(
             motion_threshold=0.7,   # Catch high-motion action
             audio_threshold=0.22,   # Balanced for significant crowd reactions (peaks at 0.25-0.3)
+            gemini_service_tier=os.getenv("GEMINI_SERVICE_TIER"),  # e.g. "priority" for live demos
         )
         print("✅ Video pipeline initialized with audio processing enabled")
     except Exception as e:
@@ -52,6 +64,7 @@ async def lifespan(app: FastAPI):
         print("   (Gemini API key might be missing)")
 
     yield
+    await close_session()
     print("👋 Vibe Check backend shutting down...")
 
 
@@ -60,6 +73,8 @@ app = FastAPI(
     description="Realtime producer copilot for sports and live entertainment",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson serializes large /api/moments payloads much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for frontend
@@ -72,13 +87,31 @@ app.add_middleware(
 )
 
 
-# In-memory storage (replace with database later)
-moments_store: dict[str, MomentAnalysis] = {}
-candidates_store: dict[str, CandidateEvent] = {}
+# In-memory storage (replace with database later), bounded so long live
+# sessions don't grow without limit
+moments_store: MomentStore = MomentStore()
+candidates_store: LRUDict = LRUDict(MAX_STORED_CANDIDATES)
+
+# Serialized /api/moments bodies per status filter: status -> (version, body).
+# Reused until moments_store.version moves, so an idle UI poll costs no
+# serialization at all.
+_moments_cache: dict[Optional[str], tuple[int, bytes]] = {}
+# Distinguishes ETags across restarts, since the store version restarts at 0
+_boot_id = uuid.uuid4().hex[:8]
 
 # Pipeline instance
 pipeline: Optional[VideoPipeline] = None
 
+# Running ingestion jobs (the event loop only keeps weak references to tasks)
+ingest_tasks: set[asyncio.Task] = set()
+# Animated share card renders started by the regenerate endpoints
+share_card_tasks: set[asyncio.Task] = set()
+
+class MediaFileResponse(FileResponse):
+    """FileResponse with 1 MiB reads: multi-MB clips take ~16x fewer read/send hops."""
+
+    chunk_size = 1 << 20
+
 
 @app.get("/")
 async def root():
@@ -91,23 +124,35 @@ async def root():
 
 
 @app.get("/api/moments")
-async def get_moments(status: Optional[str] = None):
+async def get_moments(request: Request, status: Optional[str] = None):
     """
     Get all detected moments.
 
     Args:
         status: Optional filter by approval status (pending/approved/held)
     """
-    moments = list(moments_store.values())
-
-    # Filter by status if provided
-    if status:
-        moments = [m for m in moments if m.approval_status == status]
+    version = moments_store.version
+    etag = f'W/"{_boot_id}-{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    cached = _moments_cache.get(status)
+    if cached is not None and cached[0] == version:
+        body = cached[1]
+    else:
+        # Filter by status if provided (index lookup, not a scan)
+        if status:
+            moments = moments_store.with_status(status)
+        else:
+            moments = list(moments_store.values())
+        body = orjson.dumps({
+            "moments": [m.model_dump(mode="json") for m in moments],
+            "count": len(moments),
+        })
+        if status is None or status in moments_store.by_status:
+            _moments_cache[status] = (version, body)
 
-    return {
-        "moments": moments,
-        "count": len(moments),
-    }
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/api/moments/{moment_id}")
@@ -127,10 +172,10 @@ async def approve_moment(approval: ApprovalEvent):
     # Update moment status
     moment = moments_store[approval.moment_id]
     if approval.type == "moment.approved":
-        moment.approval_status = "approved"
+        moments_store.set_status(moment, "approved")
         print(f"✅ Moment approved: {approval.moment_id} by {approval.by}")
     else:
-        moment.approval_status = "held"
+        moments_store.set_status(moment, "held")
         print(f"⏸️  Moment held: {approval.moment_id} by {approval.by}")
 
     # TODO: Send approval event via LiveKit data channel
@@ -145,7 +190,7 @@ async def send_to_exec(moment_id: str):
         raise HTTPException(status_code=404, detail="Moment not found")
 
     moment = moments_store[moment_id]
-    moment.approval_status = "sent_to_exec"
+    moments_store.set_status(moment, "sent_to_exec")
     print(f"📤 Moment sent to exec: {moment_id}")
 
     return {"status": "ok", "moment": moment}
@@ -164,7 +209,7 @@ async def regenerate_share_card(moment_id: str, theme_name: str = "stadium"):
     
     try:
         # Re-save keyframe if needed
-        keyframe_path = await pipeline._save_keyframe(moment)
+        keyframe_path = await pipeline.save_keyframe(moment)
         
         # Generate new static card
         card_path = await pipeline.share_card_generator.generate_static_card(
@@ -175,22 +220,94 @@ async def regenerate_share_card(moment_id: str, theme_name: str = "stadium"):
         
         if card_path:
             moment.share_card_url = f"/api/share_cards/images/{os.path.basename(card_path)}"
+            moments_store.touch()
             
             # Re-start animation
-            import asyncio
-            asyncio.create_task(
+            task = asyncio.create_task(
                 pipeline.share_card_generator.generate_animated_loop(
                     moment, 
                     card_path,
                     theme_name=theme_name
                 )
             )
+            share_card_tasks.add(task)
+            task.add_done_callback(share_card_tasks.discard)
         
         return {"status": "ok", "moment": moment}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Regeneration failed: {str(e)}")
 
 
+@app.post("/api/moments/regenerate_share_cards")
+async def regenerate_share_cards(request: ShareCardBatchRequest):
+    """Regenerate share cards for several moments at once with one theme."""
+    missing = [m for m in request.moment_ids if m not in moments_store]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Moments not found: {missing}")
+
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Pipeline not initialized")
+
+    # Duplicate IDs would render the same card file twice concurrently
+    moments = [moments_store[m] for m in dict.fromkeys(request.moment_ids)]
+    keyframe_paths = await asyncio.gather(*(pipeline.save_keyframe(m) for m in moments))
+
+    generator = pipeline.share_card_generator
+    results = await generator.generate_cards_bulk(
+        [(m, request.theme_name, path) for m, path in zip(moments, keyframe_paths)]
+    )
+
+    failed = []
+    for moment, card_path in zip(moments, results):
+        if isinstance(card_path, BaseException) or not card_path:
+            failed.append(moment.moment_id)
+            continue
+        moment.share_card_url = f"/api/share_cards/images/{os.path.basename(card_path)}"
+        task = asyncio.create_task(
+            generator.generate_animated_loop(moment, card_path, theme_name=request.theme_name)
+        )
+        share_card_tasks.add(task)
+        task.add_done_callback(share_card_tasks.discard)
+    moments_store.touch()
+
+    return {"status": "ok", "moments": moments, "failed": failed}
+
+
+def _save_upload(src, dst_path: str):
+    """
+    Write an uploaded file to dst_path.
+
+    Uploads spooled to disk are copied kernel-side (copy_file_range, else
+    sendfile) without passing the bytes through Python; small in-memory
+    uploads are written directly.
+    """
+    # Calling fileno() on an in-memory SpooledTemporaryFile would force a rollover
+    in_fd = None
+    if getattr(src, "_rolled", True):
+        try:
+            in_fd = src.fileno()
+        except (AttributeError, OSError, ValueError):
+            in_fd = None
+
+    with open(dst_path, "wb") as dst:
+        if in_fd is None:
+            shutil.copyfileobj(src, dst)
+            return
+
+        chunk = 1 << 22  # 4 MiB per syscall
+        offset = src.tell()
+        out_fd = dst.fileno()
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied := os.copy_file_range(in_fd, out_fd, chunk, offset):
+                    offset += copied
+                return
+            except OSError:
+                pass  # e.g. unsupported filesystem; continue with sendfile
+        while sent := os.sendfile(out_fd, in_fd, offset, chunk):
+            offset += sent
+
+
 @app.post("/api/upload")
 async def upload_video(video: UploadFile = File(...)):
     """
@@ -203,7 +320,6 @@ async def upload_video(video: UploadFile = File(...)):
     """
     try:
         # Generate unique filename to avoid conflicts
-        import time
         timestamp = int(time.time())
         original_filename = video.filename or "video.mp4"
         # Sanitize filename
@@ -213,9 +329,8 @@ async def upload_video(video: UploadFile = File(...)):
         # Save to storage path
         video_path = os.path.join(STORAGE_PATHS["videos"], unique_filename)
 
-        # Write uploaded file to disk
-        with open(video_path, "wb") as buffer:
-            shutil.copyfileobj(video.file, buffer)
+        # Write uploaded file to disk (off the event loop)
+        await asyncio.to_thread(_save_upload, video.file, video_path)
 
         file_size = os.path.getsize(video_path)
 
@@ -253,9 +368,9 @@ async def start_ingestion(request: VideoIngestRequest):
         moments_store[moment.moment_id] = moment
         print(f"✅ Moment ready: {moment.moment_id}")
 
-    # Process video (runs in background)
-    import asyncio
-    asyncio.create_task(
+    # Process video (runs in background; decode and feature extraction run
+    # on the pipeline's worker threads so the event loop stays responsive)
+    task = asyncio.create_task(
         pipeline.process_video(
             request.video_path,
             request.stream_id,
@@ -263,6 +378,8 @@ async def start_ingestion(request: VideoIngestRequest):
             on_moment=on_moment,
         )
     )
+    ingest_tasks.add(task)
+    task.add_done_callback(ingest_tasks.discard)
 
     return {
         "status": "processing",
@@ -289,7 +406,7 @@ async def get_clip(filename: str):
     if not os.path.exists(clip_path):
         raise HTTPException(status_code=404, detail="Clip not found")
 
-    return FileResponse(
+    return MediaFileResponse(
         clip_path,
         media_type="video/mp4",
         filename=filename,
@@ -312,8 +429,11 @@ async def get_share_card(subfolder: str, filename: str):
     if not os.path.exists(card_path):
         raise HTTPException(status_code=404, detail="Share card file not found")
 
-    media_type = "image/png" if subfolder in ["images", "keyframes"] else "video/mp4"
-    return FileResponse(
+    # Keyframes are WebP (older ones PNG), so go by the file extension
+    media_type = mimetypes.guess_type(filename)[0] or (
+        "image/png" if subfolder in ["images", "keyframes"] else "video/mp4"
+    )
+    return MediaFileResponse(
         card_path,
         media_type=media_type,
         filename=filename,
@@ -338,9 +458,6 @@ async def create_moment_from_agent(moment_data: dict):
         "session_id": "session_abc123"
     }
     """
-    import uuid
-    from models import MomentType, MomentScores, PostCopy, ClipRecipe
-
     try:
         # Create moment without clip (just metadata for now)
         moment = MomentAnalysis(
@@ -1,6 +1,7 @@
 """Pydantic models matching the data contracts from the spec."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic.dataclasses import dataclass
 from typing import Literal, List
 from enum import Enum
 
@@ -16,7 +17,10 @@ class MomentType(str, Enum):
     OTHER = "other"
 
 
-class CandidateSignals(BaseModel):
+# Small leaf structs nested in events/moments are slotted pydantic dataclasses:
+# same validation and JSON shape as BaseModel, without a per-instance __dict__
+@dataclass(slots=True)
+class CandidateSignals:
     motion: float = Field(..., ge=0.0, le=1.0, description="Motion score 0-1")
     audio_rms: float = Field(..., ge=0.0, le=1.0, description="Audio RMS score 0-1")
     fan_buzz: float = Field(..., ge=0.0, le=1.0, description="Fan buzz score 0-1")
@@ -29,13 +33,19 @@ class CandidateEvent(BaseModel):
     signals: CandidateSignals
 
 
-class ClipRecipe(BaseModel):
+@dataclass(slots=True)
+class ClipRecipe:
     label: Literal["reaction_lead", "play", "reaction_button"]
     start_s: float = Field(..., description="Start time in seconds")
     end_s: float = Field(..., description="End time in seconds")
 
 
-class PostCopy(BaseModel):
+# Validates a whole clip_recipe array in one pydantic-core call
+CLIP_RECIPE_ADAPTER = TypeAdapter(List[ClipRecipe])
+
+
+@dataclass(slots=True)
+class PostCopy:
     hype: str = Field(..., description="High-energy copy variant")
     neutral: str = Field(..., description="Neutral tone copy variant")
     brand_safe: str = Field(..., description="Brand-safe copy variant")
@@ -59,7 +69,8 @@ class MatchStats(BaseModel):
     key_stats: List[str] = Field(default_factory=list, description="Key statistics, e.g. ['Mahomes: 287 yds, 3 TD']")
 
 
-class MomentScores(BaseModel):
+@dataclass(slots=True)
+class MomentScores:
     hype: int = Field(..., ge=0, le=100, description="Hype score 0-100")
     risk: int = Field(..., ge=0, le=100, description="Risk score 0-100")
 
@@ -92,6 +103,11 @@ class ApprovalEvent(BaseModel):
     at: float = Field(..., description="Timestamp of approval/hold")
 
 
+class ShareCardBatchRequest(BaseModel):
+    moment_ids: list[str] = Field(..., description="Moments to regenerate share cards for")
+    theme_name: str = "stadium"
+
+
 class VideoIngestRequest(BaseModel):
     video_path: str = Field(..., description="Path to MP4 file to ingest")
     stream_id: str = Field(..., description="Unique identifier for this stream")
@@ -5,12 +5,22 @@ Combines ingestion → detection → Gemini analysis.
 """
 
 import logging
+import os
 from typing import Optional
 import asyncio
-import os
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+import cv2
+import numpy as np
+
 from ingest import VideoIngester, RingBuffer
+from ingest.ring_buffer import SPARE_FRAME_SLOTS
 from detection import FeatureExtractor, CandidateDetector
 from gemini_analyzer import GeminiAnalyzer
 from clips import ClipAssembler
@@ -19,6 +29,39 @@ from models import CandidateEvent, MomentAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Decoded frames the reader thread may queue ahead of processing. Each one sits
+# in a ring buffer slab slot, plus one being decoded and one being pushed, so
+# this must leave that many spare slots
+READ_AHEAD_FRAMES = SPARE_FRAME_SLOTS - 2
+
+# Queue end marker from the reader thread
+_EOF = object()
+
+# Candidates dispatched to Gemini together: the analysis worker waits up to
+# ANALYSIS_BATCH_WINDOW seconds after a candidate for others to join it
+ANALYSIS_BATCH_SIZE = 4
+ANALYSIS_BATCH_WINDOW = 0.5
+
+# Share card keyframes are WebP: encoded straight from BGR by OpenCV, and
+# several times smaller and faster to write than PNG
+KEYFRAME_WEBP_QUALITY = 85
+
+# Batches whose Gemini calls may be in flight at once (bounds concurrent
+# requests to ANALYSIS_BATCH_SIZE * this, against rate limits)
+MAX_BATCHES_IN_FLIGHT = 2
+
+# Minimum time between candidate triggers
+DETECTOR_COOLDOWN_SECONDS = 10.0
+
+# A time range (shard) after the video start also decodes this much video
+# before its start, so detector smoothing/cooldown and the ring buffer are warm
+# (keyframes reach back 10s before a trigger); candidates there are dropped
+SHARD_OVERLAP_SECONDS = 20.0
+
+# Candidate IDs of shard i start at i * this, keeping IDs (and moment/clip file
+# names) unique across shards
+SHARD_CANDIDATE_ID_STRIDE = 1000
+
 
 class VideoPipeline:
     """
@@ -33,6 +76,7 @@ class VideoPipeline:
         motion_threshold: float = 0.65,
         audio_threshold: float = 0.65,
         clips_output_dir: str = "./storage/clips",
+        gemini_service_tier: Optional[str] = None,
     ):
         """
         Initialize pipeline.
@@ -42,19 +86,38 @@ class VideoPipeline:
             motion_threshold: Threshold for motion detection
             audio_threshold: Threshold for audio detection
             clips_output_dir: Directory for generated clips
+            gemini_service_tier: Gemini service tier for moment analysis
+                ("priority" for interactive use, "flex" for bulk reprocessing)
         """
+        # Compile detection kernels now so the first video frame isn't stalled
+        FeatureExtractor.warmup()
+        CandidateDetector.warmup()
+
         self.feature_extractor = FeatureExtractor()
         self.candidate_detector = CandidateDetector(
             motion_threshold=motion_threshold,
             audio_threshold=audio_threshold,
             smoothing_window=3,      # Faster reaction to audio spikes (was 5)
-            cooldown_seconds=10.0,   # Longer cooldown to avoid duplicate detections (was 5)
+            cooldown_seconds=DETECTOR_COOLDOWN_SECONDS,  # Avoid duplicate detections (was 5)
         )
         self.gemini_analyzer = GeminiAnalyzer(api_key=gemini_api_key)
+        self.gemini_service_tier = gemini_service_tier
         self.clip_assembler = ClipAssembler(output_dir=clips_output_dir)
         self.share_card_generator = ShareCardGenerator()
+        # Created once here rather than checked on every keyframe save
+        self._keyframe_dir = Path("./storage/share_cards/keyframes")
+        self._keyframe_dir.mkdir(parents=True, exist_ok=True)
         self.ring_buffer = RingBuffer(duration_seconds=70.0, fps=30.0)
 
+        # Feature extraction and read-queue waits (decode has its own reader thread)
+        self._frame_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline-frames")
+
+        # Busy seconds per pipeline stage for the last process_video call.
+        # Stages overlap, so these add up to more than the wall-clock time.
+        self.stage_seconds: dict[str, float] = {}
+        # (candidates in batch, Gemini seconds) per analysis batch of that call
+        self.batch_latencies: list[tuple[int, float]] = []
+
         logger.info("🎬 Video pipeline initialized")
 
     async def process_video(
@@ -63,6 +126,8 @@ class VideoPipeline:
         stream_id: str,
         on_candidate: Optional[callable] = None,
         on_moment: Optional[callable] = None,
+        start_s: float = 0.0,
+        end_s: Optional[float] = None,
     ) -> list[MomentAnalysis]:
         """
         Process a video file end-to-end.
@@ -72,6 +137,9 @@ class VideoPipeline:
             stream_id: Unique stream identifier
             on_candidate: Callback when candidate detected
             on_moment: Callback when moment analyzed
+            start_s: Only emit candidates from this time on; decoding starts
+                SHARD_OVERLAP_SECONDS earlier to warm up detection
+            end_s: Stop decoding at this time (None = end of video)
 
         Returns:
             List of analyzed moments
@@ -79,78 +147,177 @@ class VideoPipeline:
         logger.info(f"🎥 Starting pipeline for {stream_id}: {video_path}")
 
         moments = []
+        self.stage_seconds = dict.fromkeys(("decode", "features", "analysis", "finish"), 0.0)
+        stats = self.stage_seconds
+        self.batch_latencies = []
+
+        # Opening the ingester decodes the whole audio track and builds the RMS
+        # table, so do it off the event loop (it can take seconds on long videos)
+        ingester = await asyncio.to_thread(
+            VideoIngester, video_path, stream_id, realtime_mode=False
+        )
 
-        with VideoIngester(video_path, stream_id, realtime_mode=False) as ingester:
+        with ingester:
             logger.info(f"📹 Video info: {ingester.get_info()}")
 
-            # Process frames
-            for timestamp, frame in ingester.ingest_frames():
-                # Store in ring buffer
-                self.ring_buffer.push_frame(timestamp, frame)
-
-                # Extract features
-                features = self.feature_extractor.extract_features(frame)
-                self.ring_buffer.push_features(timestamp, features)
-
-                # Check for candidate
-                audio_rms = ingester.extract_audio_rms()
-                candidate = self.candidate_detector.process_frame(
-                    timestamp, features, audio_rms
-                )
-
-                if candidate:
-                    logger.info(f"🔔 Candidate detected: {candidate.candidate_id} at t={timestamp:.2f}s")
-
-                    if on_candidate:
-                        await on_candidate(candidate)
-
-                    # Analyze with Gemini
-                    moment = await self._analyze_candidate(candidate, ingester)
-
-                    if moment:
-                        # Generate clip for the moment
-                        clip_path = await self._generate_clip(moment, ingester.video_path)
-                        if clip_path:
-                            moment.clip_url = f"/api/clips/{Path(clip_path).name}"
-
-                        # Generate share card (Static only - animation disabled for performance)
-                        try:
-                            # Save a keyframe from the ring buffer for the card
-                            keyframe_path = await self._save_keyframe(moment)
-
-                            # Generate static card
-                            card_path = await self.share_card_generator.generate_static_card(
-                                moment,
-                                theme_name="stadium", # Default theme
-                                keyframe_path=keyframe_path
-                            )
-                            if card_path:
-                                moment.share_card_url = f"/api/share_cards/images/{Path(card_path).name}"
-                        except Exception as e:
-                            logger.warning(f"⚠️ Share card generation failed: {e}")
-
-                        moments.append(moment)
+            loop = asyncio.get_running_loop()
+            # A reader thread decodes up to READ_AHEAD_FRAMES ahead while
+            # frames are processed here; the bounded queue provides back-pressure
+            frames_q: queue.Queue = queue.Queue(maxsize=READ_AHEAD_FRAMES)
+            stop = threading.Event()
+            reader = threading.Thread(
+                target=self._read_frames,
+                args=(ingester, frames_q, stop, max(0.0, start_s - SHARD_OVERLAP_SECONDS), end_s),
+                name=f"pipeline-reader-{stream_id}",
+                daemon=True,
+            )
+            reader.start()
 
-                        if on_moment:
-                            await on_moment(moment)
+            # Candidates are analyzed by a background worker so a Gemini
+            # round-trip doesn't stall decoding
+            candidate_q: asyncio.Queue = asyncio.Queue()
+            analysis = asyncio.create_task(
+                self._analysis_worker(candidate_q, ingester.video_path, moments, on_moment)
+            )
 
+            try:
+                # Process frames
+                while True:
+                    item = await loop.run_in_executor(self._frame_pool, frames_q.get)
+                    if item is _EOF:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    timestamp, frame, audio_rms = item
+
+                    # Store in ring buffer
+                    self.ring_buffer.push_frame(timestamp, frame)
+
+                    # Extract features (motion only while the detector is cooling down).
+                    # Runs on a worker thread so the event loop keeps serving requests.
+                    started = time.perf_counter()
+                    features = await loop.run_in_executor(
+                        self._frame_pool,
+                        partial(
+                            self.feature_extractor.extract_features,
+                            frame,
+                            full=not self.candidate_detector.in_cooldown(timestamp),
+                        ),
+                    )
+                    self.ring_buffer.push_features(timestamp, features)
+
+                    # Check for candidate
+                    candidate = self.candidate_detector.process_frame(
+                        timestamp, self.feature_extractor.feature_vector, audio_rms
+                    )
+                    stats["features"] += time.perf_counter() - started
+
+                    if candidate and timestamp < start_s:
+                        # Warm-up overlap - the previous time range reports this one
+                        candidate = None
+
+                    if candidate:
+                        logger.info(f"🔔 Candidate detected: {candidate.candidate_id} at t={timestamp:.2f}s")
+
+                        if on_candidate:
+                            await on_candidate(candidate)
+
+                        # Queue for Gemini analysis; decoding carries on meanwhile
+                        job = self._prepare_candidate(candidate, ingester)
+                        if job:
+                            candidate_q.put_nowait(job)
+
+                # Wait for queued analyses (the capture stays open for clips)
+                candidate_q.put_nowait(None)
+                await analysis
+            finally:
+                if not analysis.done():
+                    analysis.cancel()
+                    await asyncio.gather(analysis, return_exceptions=True)
+                # Don't release the capture while the reader is still decoding
+                stop.set()
+                while reader.is_alive():
+                    try:
+                        frames_q.get_nowait()  # Unblock a put() waiting on a full queue
+                    except queue.Empty:
+                        await asyncio.to_thread(reader.join, 0.1)
+                # Drop what the reader queued before exiting, then wake a get()
+                # orphaned by cancellation so it frees its worker
+                while True:
+                    try:
+                        frames_q.get_nowait()
+                    except queue.Empty:
+                        break
+                frames_q.put_nowait(_EOF)
+
+        # Batches finish out of order; report moments in video order
+        moments.sort(key=lambda m: m.t0)
         logger.info(f"✅ Pipeline complete: {len(moments)} moments detected")
+        logger.info(
+            "⏱️  Stage busy time: "
+            + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in stats.items())
+        )
         return moments
 
-    async def _analyze_candidate(
+    def _read_frames(
+        self,
+        ingester: VideoIngester,
+        frames_q: queue.Queue,
+        stop: threading.Event,
+        decode_from: float = 0.0,
+        end_s: Optional[float] = None,
+    ):
+        """Reader thread: decode into ring buffer slots and queue (ts, frame, rms)."""
+        stats = self.stage_seconds
+        try:
+            if decode_from > 0:
+                ingester.seek(decode_from)
+            # Decode straight into ring buffer slots (no per-frame allocation)
+            started = time.perf_counter()
+            for timestamp, frame in ingester.ingest_frames(
+                frame_buffer=self.ring_buffer.reserve_frame_slot
+            ):
+                if end_s is not None and timestamp >= end_s:
+                    break
+                # Read audio before the next decode advances the frame index
+                item = (timestamp, frame, ingester.extract_audio_rms())
+                stats["decode"] += time.perf_counter() - started
+                if not self._put_frame(frames_q, item, stop):
+                    return
+                started = time.perf_counter()
+            self._put_frame(frames_q, _EOF, stop)
+        except Exception as e:
+            self._put_frame(frames_q, e, stop)
+
+    @staticmethod
+    def _put_frame(frames_q: queue.Queue, item, stop: threading.Event) -> bool:
+        """Queue item for the processing loop; False if stopped before it fit."""
+        while not stop.is_set():
+            try:
+                frames_q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _prepare_candidate(
         self,
         candidate: CandidateEvent,
         ingester: VideoIngester,
-    ) -> Optional[MomentAnalysis]:
+    ) -> Optional[tuple[CandidateEvent, dict, Optional[np.ndarray]]]:
         """
-        Analyze a candidate with Gemini.
+        Snapshot what Gemini analysis of a candidate needs from the ring buffer.
+
+        Ring buffer frames are overwritten as decoding continues, so the
+        keyframes (and the share card frame at t0) are copied out now.
 
         Args:
             candidate: Detected candidate event
             ingester: Video ingester for context
 
         Returns:
-            MomentAnalysis or None if analysis fails
+            (candidate, analyze_moment kwargs, share card frame), or None if
+            there are no frames for the moment
         """
         t0 = candidate.t0
 
@@ -179,30 +346,154 @@ class VideoPipeline:
             logger.warning(f"⚠️  No frames in buffer for moment {candidate.candidate_id}")
             return None
 
-        logger.info(f"🤖 Analyzing with Gemini: {candidate.candidate_id}")
+        # Only the keyframes the analyzer will pick are kept (selecting again
+        # from this subset yields the same frames)
+        keyframes = [
+            (ts, frame.copy())
+            for ts, frame in self.gemini_analyzer.select_keyframes(frames, t0, tr)
+        ]
+        # The frame nearest t0 is always among them - reuse it for the share
+        # card instead of another window lookup and copy (both only read it)
+        share_frame = min(keyframes, key=lambda kf: abs(kf[0] - t0))[1]
+
+        kwargs = dict(
+            candidate_id=candidate.candidate_id,
+            t0=t0,
+            tr=tr,
+            frames=keyframes,
+            motion_score=candidate.signals.motion,
+            audio_rms=candidate.signals.audio_rms,
+            service_tier=self.gemini_service_tier,
+        )
+        return candidate, kwargs, share_frame
+
+    async def _analysis_worker(
+        self,
+        candidate_q: asyncio.Queue,
+        video_path: Path,
+        moments: list[MomentAnalysis],
+        on_moment: Optional[callable],
+    ):
+        """
+        Drain queued candidates in small batches and analyze them with Gemini.
 
+        Candidates arriving within ANALYSIS_BATCH_WINDOW of each other go out
+        as one set of overlapping requests. Each batch runs as its own task so
+        the next one can start while clips and cards are generated. A None
+        entry ends the worker once everything queued before it is done.
+        """
+        loop = asyncio.get_running_loop()
+        gemini_slots = asyncio.Semaphore(MAX_BATCHES_IN_FLIGHT)
+        pending: set[asyncio.Task] = set()
+        done = False
         try:
-            # Run Gemini analysis (this is a blocking call, but fast with Flash model)
-            moment = await asyncio.to_thread(
-                self.gemini_analyzer.analyze_moment,
-                candidate_id=candidate.candidate_id,
-                t0=t0,
-                tr=tr,
-                frames=frames,
-                motion_score=candidate.signals.motion,
-                audio_rms=candidate.signals.audio_rms,
+            while not done:
+                job = await candidate_q.get()
+                if job is None:
+                    break
+                batch = [job]
+                deadline = loop.time() + ANALYSIS_BATCH_WINDOW
+                while len(batch) < ANALYSIS_BATCH_SIZE:
+                    try:
+                        job = await asyncio.wait_for(candidate_q.get(), deadline - loop.time())
+                    except asyncio.TimeoutError:
+                        break
+                    if job is None:
+                        done = True
+                        break
+                    batch.append(job)
+
+                task = asyncio.create_task(
+                    self._handle_batch(batch, gemini_slots, video_path, moments, on_moment)
+                )
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _handle_batch(
+        self,
+        batch: list[tuple[CandidateEvent, dict, Optional[np.ndarray]]],
+        gemini_slots: asyncio.Semaphore,
+        video_path: Path,
+        moments: list[MomentAnalysis],
+        on_moment: Optional[callable],
+    ):
+        """Analyze one batch, then finish its moments concurrently."""
+        for candidate, _, _ in batch:
+            logger.info(f"🤖 Analyzing with Gemini: {candidate.candidate_id}")
+        async with gemini_slots:
+            # Run Gemini analysis on the async client (doesn't tie up a worker thread)
+            started = time.perf_counter()
+            results = await self.gemini_analyzer.analyze_moments_concurrent(
+                [kwargs for _, kwargs, _ in batch]
             )
+            elapsed = time.perf_counter() - started
+            self.stage_seconds["analysis"] += elapsed
+            self.batch_latencies.append((len(batch), elapsed))
 
-            logger.info(
-                f"✅ Moment analyzed: {moment.moment_id} "
-                f"(type={moment.moment_type}, hype={moment.scores.hype})"
+        await asyncio.gather(*(
+            self._handle_candidate(
+                results[candidate.candidate_id], share_frame, video_path, moments, on_moment
             )
+            for candidate, _, share_frame in batch
+        ))
 
-            return moment
+    async def _handle_candidate(
+        self,
+        moment: MomentAnalysis,
+        share_frame: Optional[np.ndarray],
+        video_path: Path,
+        moments: list[MomentAnalysis],
+        on_moment: Optional[callable],
+    ):
+        """Generate a moment's clip and share card, then publish it."""
+        logger.info(
+            f"✅ Moment analyzed: {moment.moment_id} "
+            f"(type={moment.moment_type}, hype={moment.scores.hype})"
+        )
+        started = time.perf_counter()
+        await self._finish_moment(moment, video_path, share_frame)
+        self.stage_seconds["finish"] += time.perf_counter() - started
+
+        moments.append(moment)
+
+        if on_moment:
+            await on_moment(moment)
 
+    async def _finish_moment(
+        self,
+        moment: MomentAnalysis,
+        video_path: Path,
+        share_frame: Optional[np.ndarray],
+    ):
+        """Generate the clip and static share card for an analyzed moment."""
+        # Clip assembly (ffmpeg) and the keyframe save (the card's input) are
+        # independent, so run them side by side on worker threads. Save the
+        # keyframe snapshotted at detection time for the card.
+        clip_path, keyframe_path = await asyncio.gather(
+            self._generate_clip(moment, video_path),
+            self.save_keyframe(moment, frame=share_frame),
+        )
+        if clip_path:
+            moment.clip_url = f"/api/clips/{Path(clip_path).name}"
+
+        # Generate share card (Static only - animation disabled for performance)
+        try:
+            # Generate static card
+            card_path = await self.share_card_generator.generate_static_card(
+                moment,
+                theme_name="stadium", # Default theme
+                keyframe_path=keyframe_path
+            )
+            if card_path:
+                moment.share_card_url = f"/api/share_cards/images/{Path(card_path).name}"
         except Exception as e:
-            logger.error(f"❌ Gemini analysis failed for {candidate.candidate_id}: {e}")
-            return None
+            logger.warning(f"⚠️ Share card generation failed: {e}")
 
     async def _generate_clip(
         self,
@@ -236,35 +527,36 @@ class VideoPipeline:
             logger.error(f"❌ Clip generation failed for {moment.moment_id}: {e}")
             return None
 
-    async def _save_keyframe(self, moment: MomentAnalysis) -> Optional[str]:
-        """Save a keyframe image from the ring buffer for the share card."""
+    async def save_keyframe(
+        self, moment: MomentAnalysis, frame: Optional[np.ndarray] = None
+    ) -> Optional[str]:
+        """Save a keyframe image for the share card (from the ring buffer unless given)."""
         try:
-            # Pick frame at t0
-            frames = self.ring_buffer.get_frames_in_window(moment.t0 - 0.1, moment.t0 + 0.1)
-            if not frames:
-                return None
-            
-            # Use the middle frame in the window
-            _, frame = frames[len(frames) // 2]
-            
-            # Convert to PIL and save
-            from PIL import Image
-            import numpy as np
-            
-            # BGR to RGB
-            frame_rgb = frame[:, :, ::-1]
-            img = Image.fromarray(frame_rgb)
-            
-            output_path = f"./storage/share_cards/keyframes/{moment.moment_id}_keyframe.png"
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            img.save(output_path)
+            if frame is None:
+                # Pick frame at t0
+                frames = self.ring_buffer.get_frames_in_window(moment.t0 - 0.1, moment.t0 + 0.1)
+                if not frames:
+                    return None
+
+                # Use the middle frame in the window
+                _, frame = frames[len(frames) // 2]
             
+            output_path = str(self._keyframe_dir / f"{moment.moment_id}_keyframe.webp")
+            # Image encoding is CPU-bound; keep it off the event loop
+            await asyncio.to_thread(self._write_keyframe, frame, output_path)
+
             return output_path
         except Exception as e:
             logger.warning(f"Could not save keyframe: {e}")
             return None
 
 
+    def _write_keyframe(self, frame: np.ndarray, output_path: str):
+        # OpenCV encodes BGR directly - no channel flip or PIL copy
+        if not cv2.imwrite(output_path, frame, [cv2.IMWRITE_WEBP_QUALITY, KEYFRAME_WEBP_QUALITY]):
+            raise IOError(f"Could not encode keyframe to {output_path}")
+
+
 async def process_video_simple(
     video_path: str,
     stream_id: str = "demo",
@@ -282,3 +574,100 @@ async def process_video_simple(
     pipeline = VideoPipeline()
     moments = await pipeline.process_video(video_path, stream_id)
     return moments
+
+
+def _process_shard(
+    video_path: str,
+    stream_id: str,
+    shard_idx: int,
+    start_s: float,
+    end_s: float,
+    pipeline_kwargs: dict,
+) -> tuple[list[MomentAnalysis], dict]:
+    """Worker process: run a VideoPipeline over one time range of the video."""
+    pipeline = VideoPipeline(**pipeline_kwargs)
+    pipeline.candidate_detector.candidate_counter = shard_idx * SHARD_CANDIDATE_ID_STRIDE
+
+    started = time.perf_counter()
+    moments = asyncio.run(pipeline.process_video(
+        video_path, f"{stream_id}-{shard_idx}", start_s=start_s, end_s=end_s
+    ))
+    stats = {
+        "start_s": start_s,
+        "end_s": end_s,
+        "seconds": time.perf_counter() - started,
+        "batch_latencies": pipeline.batch_latencies,
+    }
+    return moments, stats
+
+
+async def process_video_sharded(
+    video_path: str,
+    stream_id: str = "demo",
+    n_workers: Optional[int] = None,
+    **pipeline_kwargs,
+) -> tuple[list[MomentAnalysis], list[dict]]:
+    """
+    Process a video as n_workers time ranges in parallel worker processes.
+
+    Each worker runs its own VideoPipeline (decode, features, Gemini, clips)
+    over one range, so the CPU-bound stages scale with cores instead of
+    sharing one GIL. Each worker keeps its own ring buffer, so memory grows
+    with n_workers.
+
+    Args:
+        video_path: Path to video file
+        stream_id: Stream identifier
+        n_workers: Worker processes / time ranges (default: min(4, CPU count))
+        **pipeline_kwargs: Passed to each worker's VideoPipeline
+
+    Returns:
+        (moments in video order, per-shard stats dicts with start_s, end_s,
+        seconds and batch_latencies)
+    """
+    n_workers = n_workers or min(4, os.cpu_count() or 1)
+
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    finally:
+        cap.release()
+    duration = frames / fps if fps > 0 else 0.0
+    if duration <= 0:
+        raise ValueError(f"Could not read video duration: {video_path}")
+
+    # Ranges shorter than the warm-up overlap would mostly re-decode their neighbours
+    n_shards = max(1, min(n_workers, int(duration // SHARD_OVERLAP_SECONDS)))
+    bounds = [duration * i / n_shards for i in range(n_shards + 1)]
+    bounds[-1] = None  # Last range runs to the end of the video
+
+    loop = asyncio.get_running_loop()
+    # spawn, not fork: the parent may have numba/TBB and event loop threads running
+    with ProcessPoolExecutor(
+        max_workers=n_shards, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                pool,
+                partial(
+                    _process_shard, str(video_path), stream_id, i,
+                    bounds[i], bounds[i + 1], pipeline_kwargs,
+                ),
+            )
+            for i in range(n_shards)
+        ))
+
+    # Merge in video order; a trigger just after a range boundary doesn't know
+    # about one just before it, so re-apply the detector cooldown across shards
+    merged = sorted((m for shard_moments, _ in results for m in shard_moments), key=lambda m: m.t0)
+    moments: list[MomentAnalysis] = []
+    for moment in merged:
+        if moments and moment.t0 - moments[-1].t0 < DETECTOR_COOLDOWN_SECONDS:
+            continue
+        moments.append(moment)
+
+    shard_stats = [stats for _, stats in results]
+    for i, stats in enumerate(shard_stats):
+        logger.info(f"⏱️  Shard {i} [{stats['start_s']:.1f}s, {stats['end_s'] or duration:.1f}s]: {stats['seconds']:.2f}s")
+    return moments, shard_stats
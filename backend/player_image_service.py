@@ -1,14 +1,19 @@
 """Service for fetching official player photos for share card generation."""
 
 import os
+import asyncio
 import logging
 import hashlib
 import json
 import re
+import time
 from pathlib import Path
 from typing import Optional
-import requests
 from datetime import datetime, timedelta
+from PIL import ImageFile
+
+from http_client import get_session
+from stores import LRUDict
 
 # Try to import google-genai SDK for search grounding
 try:
@@ -18,8 +23,70 @@ try:
 except ImportError:
     HAS_GENAI = False
 
+# orjson is optional - used for parsing search responses, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers match.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_JSON_DECODER = json.JSONDecoder()
+
 logger = logging.getLogger(__name__)
 
+# Leading magic bytes of the image formats photo sources serve
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"GIF8", "GIF"),
+)
+
+
+def _sniff_image_format(path: Path) -> Optional[str]:
+    """
+    Identify an image file from its header without decoding it.
+
+    Known formats are matched by magic bytes; anything else must at least
+    parse as an image header within its first 1 KB.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1024)
+    for signature, fmt in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return fmt
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+
+    parser = ImageFile.Parser()
+    try:
+        parser.feed(head)
+    except Exception:
+        return None
+    return parser.image.format if parser.image is not None else None
+
+# Headshots are 100-500 KB; 64 KiB chunks keep per-chunk overhead
+# (loop iterations, write() syscalls) to a handful per photo
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Player lookups remembered in memory in front of the disk cache
+MAX_MEM_CACHED_PHOTOS = 1024
+
+# On-disk photo cache bounds; least recently accessed photos are evicted past these
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+MAX_CACHE_FILES = 5000
+
+# Present once the cache dir holds BLAKE2b-keyed files (older ones were MD5-keyed)
+_KEY_SCHEME_MARKER = ".keys-blake2b"
+
+# Image extension at the end of the URL or right before the query string
+_IMAGE_EXT_RE = re.compile(r"\.(?:jpe?g|png|webp|gif)(?:\?|$)", re.IGNORECASE)
+# Common image path segments and image CDN hosts
+_IMAGE_PATH_RE = re.compile(
+    r"/(?:image|photo|headshot|player|athletes)/|cloudinary|imgix|akamai|fastly|cdn",
+    re.IGNORECASE,
+)
+
 
 class PlayerImageService:
     """
@@ -38,7 +105,14 @@ class PlayerImageService:
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._migrate_cache_keys()
         self.cache_ttl = timedelta(days=7)  # Photos don't change often
+        # "Not found" results expire sooner, in case a photo turns up later
+        self.neg_ttl = timedelta(hours=1)
+
+        # cache_key -> (expires_at wall-clock time, photo path or None if not found);
+        # avoids a stat per lookup and repeated searches for unknown players
+        self._mem_cache = LRUDict(MAX_MEM_CACHED_PHOTOS)
 
         # Initialize Gemini client for search grounding
         self.genai_client = None
@@ -79,9 +153,15 @@ class PlayerImageService:
         cache_key = self._generate_cache_key(player_name, team)
         cached_path = self.cache_dir / f"{cache_key}.jpg"
 
-        # Check cache
+        # Check memory cache, then disk cache
+        entry = self._mem_cache.get(cache_key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+
         if self._is_cache_valid(cached_path):
             logger.info(f"✅ Using cached photo for {player_name}")
+            expires_at = cached_path.stat().st_mtime + self.cache_ttl.total_seconds()
+            self._mem_cache[cache_key] = (expires_at, str(cached_path))
             return str(cached_path)
 
         # Fetch new photo
@@ -90,12 +170,18 @@ class PlayerImageService:
 
         if not photo_url:
             logger.warning(f"❌ No photo found for {player_name}")
+            self._mem_cache[cache_key] = (time.time() + self.neg_ttl.total_seconds(), None)
             return None
 
         # Download and cache
         try:
             downloaded_path = await self._download_and_cache(photo_url, cached_path)
             logger.info(f"✅ Cached photo for {player_name}")
+            expires_at = time.time() + self.cache_ttl.total_seconds()
+            self._mem_cache[cache_key] = (expires_at, str(downloaded_path))
+            # The scan runs on a thread; the LRU is only touched on the event loop
+            for evicted in await asyncio.to_thread(self._enforce_cache_limits):
+                self._mem_cache.pop(evicted, None)
             return str(downloaded_path)
         except Exception as e:
             logger.error(f"❌ Failed to download photo: {e}")
@@ -178,13 +264,16 @@ If you cannot find a suitable image, respond with:
 
             # Try to parse JSON
             try:
-                data = json.loads(result_text)
+                data = _json_loads(result_text)
             except json.JSONDecodeError:
-                # Try to extract JSON from response
-                json_match = re.search(r'\{[^}]+\}', result_text, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group(0))
-                else:
+                # Try to extract the first JSON object from the response (e.g.
+                # inside a code fence); raw_decode handles nested braces
+                start = result_text.find("{")
+                try:
+                    if start < 0:
+                        raise ValueError("no JSON object")
+                    data, _ = _JSON_DECODER.raw_decode(result_text, start)
+                except ValueError:
                     logger.warning("Could not parse JSON from photo search response")
                     return None
 
@@ -213,24 +302,7 @@ If you cannot find a suitable image, respond with:
         if not url:
             return False
 
-        url_lower = url.lower()
-
-        # Check for image extensions
-        image_extensions = ['.jpg', '.jpeg', '.png', '.webp', '.gif']
-        if any(url_lower.endswith(ext) or f"{ext}?" in url_lower for ext in image_extensions):
-            return True
-
-        # Check for common image path patterns
-        image_patterns = ['/image/', '/photo/', '/headshot/', '/player/', '/athletes/']
-        if any(pattern in url_lower for pattern in image_patterns):
-            return True
-
-        # Check for image CDN patterns
-        cdn_patterns = ['cloudinary', 'imgix', 'akamai', 'fastly', 'cdn']
-        if any(pattern in url_lower for pattern in cdn_patterns):
-            return True
-
-        return False
+        return bool(_IMAGE_EXT_RE.search(url) or _IMAGE_PATH_RE.search(url))
 
     async def _download_and_cache(
         self,
@@ -251,35 +323,94 @@ If you cannot find a suitable image, respond with:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-        response = requests.get(photo_url, timeout=15, stream=True, headers=headers)
-        response.raise_for_status()
-
-        # Check content type
-        content_type = response.headers.get("content-type", "")
-        if not any(img_type in content_type.lower() for img_type in ["image/", "octet-stream"]):
-            logger.warning(f"Unexpected content type: {content_type}")
+        session = await get_session()
+        async with session.get(photo_url, headers=headers) as response:
+            response.raise_for_status()
 
-        with open(cache_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            # Check content type
+            content_type = response.headers.get("content-type", "")
+            if not any(img_type in content_type.lower() for img_type in ["image/", "octet-stream"]):
+                logger.warning(f"Unexpected content type: {content_type}")
 
-        # Verify the file is a valid image
-        try:
-            from PIL import Image
-            img = Image.open(cache_path)
-            img.verify()
-            logger.info(f"✅ Downloaded valid image: {img.format} {img.size}")
-        except Exception as e:
-            logger.error(f"Downloaded file is not a valid image: {e}")
+            # Double-buffered: each chunk is written on a worker thread while
+            # the next one is read off the socket, with one write in flight
+            with open(cache_path, "wb") as f:
+                pending = None
+                try:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        if pending is not None:
+                            await pending
+                        pending = asyncio.ensure_future(asyncio.to_thread(f.write, chunk))
+                finally:
+                    if pending is not None:
+                        await pending
+
+        # Verify the file is a valid image (header only, no full decode)
+        image_format = _sniff_image_format(cache_path)
+        if image_format is None:
+            logger.error("Downloaded file is not a valid image")
             cache_path.unlink(missing_ok=True)
-            raise ValueError(f"Invalid image file: {e}")
+            raise ValueError("Invalid image file: unrecognized header")
+        logger.info(f"✅ Downloaded valid image: {image_format}")
 
         return cache_path
 
     def _generate_cache_key(self, player_name: str, team: Optional[str]) -> str:
         """Generate cache key from player name and team."""
         key_string = f"{player_name}_{team or 'unknown'}".lower()
-        return hashlib.md5(key_string.encode()).hexdigest()
+        # Not security sensitive; BLAKE2b is built in and faster than MD5
+        return hashlib.blake2b(key_string.encode(), digest_size=16).hexdigest()
+
+    def _migrate_cache_keys(self):
+        """Drop photos cached under the old MD5 keys; they can never be hit again."""
+        marker = self.cache_dir / _KEY_SCHEME_MARKER
+        if marker.exists():
+            return
+        self._unlink_cached_photos()
+        marker.touch()
+
+    def _enforce_cache_limits(self) -> list[str]:
+        """
+        Evict least recently accessed photos until the disk cache is within bounds.
+
+        Returns:
+            Cache keys of the evicted photos (for the caller to drop from _mem_cache)
+        """
+        photos = []
+        total_bytes = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg") and entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    photos.append((max(st.st_atime, st.st_mtime), st.st_size, entry))
+                    total_bytes += st.st_size
+
+        if total_bytes <= MAX_CACHE_BYTES and len(photos) <= MAX_CACHE_FILES:
+            return []
+
+        photos.sort(key=lambda photo: photo[0])
+        remaining = len(photos)
+        evicted = []
+        for _, size, entry in photos:
+            if total_bytes <= MAX_CACHE_BYTES and remaining <= MAX_CACHE_FILES:
+                break
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            remaining -= 1
+            # The file name is the cache key
+            evicted.append(entry.name[:-len(".jpg")])
+        logger.info(f"🗑️  Evicted {len(evicted)} cached player photos")
+        return evicted
+
+    def _unlink_cached_photos(self):
+        """Delete every cached photo file (scandir reuses each entry's dirent type)."""
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg") and entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
 
     def _is_cache_valid(self, cache_path: Path) -> bool:
         """Check if cached photo exists and is within TTL."""
@@ -294,6 +425,6 @@ If you cannot find a suitable image, respond with:
 
     def clear_cache(self):
         """Clear all cached photos."""
-        for file in self.cache_dir.glob("*.jpg"):
-            file.unlink()
+        self._unlink_cached_photos()
+        self._mem_cache.clear()
         logger.info("🗑️  Player photo cache cleared")
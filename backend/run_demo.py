@@ -1,74 +1,107 @@
 """Quick script to trigger video processing via API."""
 
-import requests
+import asyncio
+import sys
 import time
 
+import aiohttp
+
 API_URL = "http://localhost:8001"
 VIDEO_PATH = "/home/aditya.puranik@corsairhq.com/gex/YTDowncom_YouTube_This-Alcaraz-Sinner-point-was-so-ridicul_Media_r3UFpeA1vJw_001_1080p.mp4"
 
-print("🎾 Starting Vibe Check Demo\n")
-
-# Check backend health
-print("1. Checking backend health...")
-try:
-    response = requests.get(f"{API_URL}/")
-    print(f"   ✅ Backend is running: {response.json()}")
-except Exception as e:
-    print(f"   ❌ Backend not reachable: {e}")
-    print("   Make sure backend is running on port 8001")
-    exit(1)
-
-# Start video ingestion
-print("\n2. Starting video ingestion...")
-try:
-    response = requests.post(
-        f"{API_URL}/api/ingest/start",
-        json={
-            "video_path": VIDEO_PATH,
-            "stream_id": "tennis_demo"
-        }
-    )
-    print(f"   ✅ Ingestion started: {response.json()}")
-except Exception as e:
-    print(f"   ❌ Failed to start ingestion: {e}")
-    exit(1)
-
-# Poll for moments
-print("\n3. Waiting for moments to be detected...")
-print("   (This will take 30-60 seconds as the video is processed)\n")
-
-for i in range(30):
-    time.sleep(2)
-    try:
-        response = requests.get(f"{API_URL}/api/moments")
-        data = response.json()
-        count = data.get("count", 0)
-
-        print(f"   [{i*2}s] Moments detected: {count}")
-
-        if count > 0:
-            print(f"\n   ✅ {count} moments ready!")
-            break
-    except Exception as e:
-        print(f"   ⚠️  Error polling: {e}")
-
-# Show final results
-print("\n4. Final results:")
-try:
-    response = requests.get(f"{API_URL}/api/moments")
-    data = response.json()
-    moments = data.get("moments", [])
-
-    print(f"   Total moments: {len(moments)}")
-    for moment in moments:
-        print(f"\n   Moment {moment['moment_id']}:")
-        print(f"     Summary: {moment['summary']}")
-        print(f"     Hype: {moment['scores']['hype']}, Risk: {moment['scores']['risk']}")
-        if moment.get('clip_url'):
-            print(f"     Clip: {API_URL}{moment['clip_url']}")
-
-except Exception as e:
-    print(f"   ❌ Failed to fetch moments: {e}")
-
-print("\n🎉 Demo complete!")
-print(f"\n📱 Open frontend to see moments: http://localhost:3001/producer")
+# Moment polling: start fast, back off to POLL_MAX_DELAY, give up after POLL_TIMEOUT
+POLL_INITIAL_DELAY = 0.5
+POLL_MAX_DELAY = 2.0
+POLL_TIMEOUT = 60.0
+
+
+async def poll_moments(session: aiohttp.ClientSession) -> int:
+    """Poll /api/moments until at least one moment exists; return the count."""
+    start = time.monotonic()
+    delay = POLL_INITIAL_DELAY
+    etag = None
+    count = 0
+
+    while time.monotonic() - start < POLL_TIMEOUT:
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, POLL_MAX_DELAY)
+        try:
+            # The backend answers 304 while the moment list is unchanged
+            headers = {"If-None-Match": etag} if etag else {}
+            async with session.get(f"{API_URL}/api/moments", headers=headers) as response:
+                if response.status == 304:
+                    continue
+                etag = response.headers.get("ETag")
+                data = await response.json()
+            count = data.get("count", 0)
+
+            print(f"   [{time.monotonic() - start:.1f}s] Moments detected: {count}")
+
+            if count > 0:
+                print(f"\n   ✅ {count} moments ready!")
+                break
+        except Exception as e:
+            print(f"   ⚠️  Error polling: {e}")
+
+    return count
+
+
+async def main():
+    print("🎾 Starting Vibe Check Demo\n")
+
+    async with aiohttp.ClientSession() as session:
+        # Check backend health
+        print("1. Checking backend health...")
+        try:
+            async with session.get(f"{API_URL}/") as response:
+                print(f"   ✅ Backend is running: {await response.json()}")
+        except Exception as e:
+            print(f"   ❌ Backend not reachable: {e}")
+            print("   Make sure backend is running on port 8001")
+            return 1
+
+        # Start video ingestion
+        print("\n2. Starting video ingestion...")
+        try:
+            async with session.post(
+                f"{API_URL}/api/ingest/start",
+                json={
+                    "video_path": VIDEO_PATH,
+                    "stream_id": "tennis_demo"
+                }
+            ) as response:
+                print(f"   ✅ Ingestion started: {await response.json()}")
+        except Exception as e:
+            print(f"   ❌ Failed to start ingestion: {e}")
+            return 1
+
+        # Poll for moments
+        print("\n3. Waiting for moments to be detected...")
+        print("   (This will take 30-60 seconds as the video is processed)\n")
+        await poll_moments(session)
+
+        # Show final results
+        print("\n4. Final results:")
+        try:
+            async with session.get(f"{API_URL}/api/moments") as response:
+                data = await response.json()
+            moments = data.get("moments", [])
+
+            print(f"   Total moments: {len(moments)}")
+            for moment in moments:
+                print(f"\n   Moment {moment['moment_id']}:")
+                print(f"     Summary: {moment['summary']}")
+                print(f"     Hype: {moment['scores']['hype']}, Risk: {moment['scores']['risk']}")
+                if moment.get('clip_url'):
+                    print(f"     Clip: {API_URL}{moment['clip_url']}")
+
+        except Exception as e:
+            print(f"   ❌ Failed to fetch moments: {e}")
+
+    print("\n🎉 Demo complete!")
+    print(f"\n📱 Open frontend to see moments: http://localhost:3001/producer")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -3,19 +3,44 @@
 import os
 import logging
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 import fal_client
-from PIL import Image
-import requests
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
 from pathlib import Path
-import base64
+import hashlib
+import mimetypes
+from functools import lru_cache
 
 from models import MomentAnalysis, MomentType
 from player_image_service import PlayerImageService
+from http_client import get_session
+from stores import LRUDict
 
 logger = logging.getLogger(__name__)
 
+# Cards generated at once by generate_cards_bulk; each card is two Fal.ai jobs
+MAX_CONCURRENT_CARDS = 8
+
+# Background-removal results remembered per reference image content hash
+MAX_CACHED_CUTOUTS = 256
+
+# Reference images are downscaled to fit this before upload; cards are 1200x630
+CUTOUT_INPUT_SIZE = (1280, 720)
+
+DEJAVU_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@lru_cache(maxsize=8)
+def _font(path: str, size: int):
+    """Load a TrueType font once per (path, size); PIL's default if unavailable."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
 THEMES = {
     "stadium": {
         "prompt_style": "epic sports moment, stadium lights, dramatic atmosphere, crowd energy",
@@ -36,6 +61,23 @@ THEMES = {
 }
 
 
+def _downscale_for_cutout(image_data: bytes) -> Optional[bytes]:
+    """
+    JPEG of the image shrunk to fit CUTOUT_INPUT_SIZE, or None if it already fits.
+
+    A smaller upload also means less BiRefNet work, and the card never needs
+    more detail than this.
+    """
+    img = Image.open(BytesIO(image_data))
+    if img.width <= CUTOUT_INPUT_SIZE[0] and img.height <= CUTOUT_INPUT_SIZE[1]:
+        return None
+    img = img.convert("RGB")
+    img.thumbnail(CUTOUT_INPUT_SIZE, Image.Resampling.LANCZOS)
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
 class ShareCardGenerator:
     """
     Generate social media share cards for moments using Nano Banana Pro.
@@ -57,6 +99,10 @@ class ShareCardGenerator:
         (self.output_dir / "images").mkdir(exist_ok=True)
         (self.output_dir / "cutouts").mkdir(exist_ok=True)
 
+        # The same keyframe/player photo is reused across themes; upload it and
+        # cut it out once. Values are tasks, so concurrent themes share one call
+        self._cutouts = LRUDict(MAX_CACHED_CUTOUTS)
+
         # Initialize player image service
         self.player_service = PlayerImageService()
 
@@ -93,15 +139,24 @@ class ShareCardGenerator:
                     logger.info(f"⚠️ No player photo found, using keyframe")
 
             # Step 1: Remove background from reference image to get subject cutout
+            # (the card prompt is built while Fal.ai works on it)
             logger.info("✂️ Removing background from reference image...")
-            cutout_url = await self._remove_background(reference_image_path)
+            cutout_task = asyncio.create_task(self._remove_background(reference_image_path))
+            prompt = self._build_card_prompt(moment, theme)
+            try:
+                cutout_url = await cutout_task
+            except FileNotFoundError:
+                if reference_image_path == keyframe_path:
+                    raise
+                # Photo cache eviction can unlink a photo between lookup and read
+                logger.info("⚠️ Player photo was evicted from the cache, using keyframe")
+                cutout_url = await self._remove_background(keyframe_path)
 
             # Step 2: Generate stylized share card with Nano Banana Pro
             logger.info("🎨 Generating share card with Nano Banana Pro...")
             card_image = await self._generate_with_nano_banana(
-                moment=moment,
                 cutout_url=cutout_url,
-                theme=theme
+                prompt=prompt
             )
 
             # Step 3: Save the result
@@ -116,41 +171,75 @@ class ShareCardGenerator:
             # Fallback to simple keyframe-based card
             return await self._generate_fallback_card(moment, keyframe_path, theme_name)
 
-    async def _remove_background(self, image_path: str) -> str:
-        """Remove background from image using BiRefNet."""
+    async def generate_cards_bulk(
+        self,
+        jobs: List[Tuple[MomentAnalysis, str, Optional[str]]],
+        max_concurrent: int = MAX_CONCURRENT_CARDS,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Generate share cards for many moments with bounded concurrency.
+
+        Args:
+            jobs: (moment, theme_name, keyframe_path) per card
+            max_concurrent: Most cards in flight at once (keeps Fal.ai rate limits)
+
+        Returns:
+            Card path or raised exception per job, in job order
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
 
-        # Upload image to fal
+        async def _generate(moment, theme_name, keyframe_path):
+            async with semaphore:
+                return await self.generate_static_card(moment, theme_name, keyframe_path)
+
+        return await asyncio.gather(
+            *(_generate(*job) for job in jobs), return_exceptions=True
+        )
+
+    async def _remove_background(self, image_path: str) -> str:
+        """Remove background from image using BiRefNet (memoized by image content)."""
         with open(image_path, "rb") as f:
             image_data = f.read()
 
-        # Convert to base64 data URL
-        base64_image = base64.b64encode(image_data).decode("utf-8")
-        data_url = f"data:image/png;base64,{base64_image}"
-
-        def _run():
-            return fal_client.run(
-                "fal-ai/birefnet",
-                arguments={
-                    "image_url": data_url,
-                    "model": "General Use (Light)",
-                    "output_format": "png"
-                }
-            )
-
-        result = await asyncio.to_thread(_run)
+        digest = hashlib.sha1(image_data).hexdigest()
+        task = self._cutouts.get(digest)
+        if task is None:
+            task = asyncio.ensure_future(self._run_background_removal(image_path, image_data))
+            self._cutouts[digest] = task
+        try:
+            # Shielded so one cancelled caller doesn't cancel the shared call
+            return await asyncio.shield(task)
+        except Exception:
+            # Don't remember failures; the next card retries
+            if self._cutouts.get(digest) is task:
+                del self._cutouts[digest]
+            raise
+
+    async def _run_background_removal(self, image_path: str, image_data: bytes) -> str:
+        # Upload image to fal (a short CDN URL instead of an inline base64
+        # data URL, which would inflate the request JSON by a third)
+        mime_type = mimetypes.guess_type(image_path)[0] or "image/png"
+        file_name = os.path.basename(image_path)
+        downscaled = await asyncio.to_thread(_downscale_for_cutout, image_data)
+        if downscaled is not None:
+            image_data, mime_type = downscaled, "image/jpeg"
+            file_name = f"{os.path.splitext(file_name)[0]}.jpg"
+        image_url = await fal_client.upload_async(image_data, mime_type, file_name=file_name)
+
+        result = await fal_client.run_async(
+            "fal-ai/birefnet",
+            arguments={
+                "image_url": image_url,
+                "model": "General Use (Light)",
+                "output_format": "png"
+            }
+        )
 
         # Return the URL of the cutout image
         return result["image"]["url"]
 
-    async def _generate_with_nano_banana(
-        self,
-        moment: MomentAnalysis,
-        cutout_url: str,
-        theme: Dict[str, Any]
-    ) -> Image.Image:
-        """Generate share card using Nano Banana Pro with the subject cutout."""
-
-        # Build a prompt that describes the desired share card
+    def _build_card_prompt(self, moment: MomentAnalysis, theme: Dict[str, Any]) -> str:
+        """Build a prompt that describes the desired share card."""
         moment_type = moment.moment_type.value if hasattr(moment.moment_type, 'value') else str(moment.moment_type)
 
         # Add player-specific context if available
@@ -161,7 +250,7 @@ The athlete in the reference image is {moment.player_info.name} from {moment.pla
 The person should be recognizable as {moment.player_info.name}.
 """
 
-        prompt = f"""Create a professional sports social media share card (1200x630 pixels).
+        return f"""Create a professional sports social media share card (1200x630 pixels).
 
 The image should feature the person from the reference image prominently in the center-right.
 {player_context}
@@ -178,24 +267,33 @@ Make it look like an ESPN or Bleacher Report highlight card.
 Dynamic composition, the subject should look heroic and energetic.
 High contrast, vibrant colors, broadcast quality."""
 
-        def _run():
-            return fal_client.run(
-                "fal-ai/nano-banana-pro",
-                arguments={
-                    "prompt": prompt,
-                    "image_url": cutout_url,  # Reference image (the cutout)
-                    "image_size": {"width": 1200, "height": 630},
-                    "num_inference_steps": 30,
-                    "guidance_scale": 7.5,
-                }
-            )
-
-        result = await asyncio.to_thread(_run)
+    async def _generate_with_nano_banana(
+        self,
+        cutout_url: str,
+        prompt: str
+    ) -> Image.Image:
+        """Generate share card using Nano Banana Pro with the subject cutout."""
+        result = await fal_client.run_async(
+            "fal-ai/nano-banana-pro",
+            arguments={
+                "prompt": prompt,
+                "image_url": cutout_url,  # Reference image (the cutout)
+                "image_size": {"width": 1200, "height": 630},
+                "num_inference_steps": 30,
+                "guidance_scale": 7.5,
+            }
+        )
         image_url = result["images"][0]["url"]
 
         # Download the generated image
-        response = requests.get(image_url)
-        return Image.open(BytesIO(response.content))
+        return Image.open(BytesIO(await self._download(image_url)))
+
+    async def _download(self, url: str) -> bytes:
+        """Fetch a generated image over the shared HTTP session."""
+        session = await get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
 
     async def _generate_text_only_card(
         self,
@@ -217,22 +315,18 @@ Text to include:
 Make it look like a breaking news sports graphic.
 Bold typography, dynamic composition, broadcast quality."""
 
-        def _run():
-            return fal_client.run(
-                "fal-ai/nano-banana-pro",
-                arguments={
-                    "prompt": prompt,
-                    "image_size": {"width": 1200, "height": 630},
-                    "num_inference_steps": 30,
-                    "guidance_scale": 7.5,
-                }
-            )
-
-        result = await asyncio.to_thread(_run)
+        result = await fal_client.run_async(
+            "fal-ai/nano-banana-pro",
+            arguments={
+                "prompt": prompt,
+                "image_size": {"width": 1200, "height": 630},
+                "num_inference_steps": 30,
+                "guidance_scale": 7.5,
+            }
+        )
         image_url = result["images"][0]["url"]
 
-        response = requests.get(image_url)
-        img = Image.open(BytesIO(response.content))
+        img = Image.open(BytesIO(await self._download(image_url)))
 
         output_path = self.output_dir / "images" / f"{moment.moment_id}_{theme_name}.png"
         img.save(output_path, "PNG")
@@ -246,31 +340,23 @@ Bold typography, dynamic composition, broadcast quality."""
         theme_name: str
     ) -> str:
         """Simple fallback: just use the keyframe with minimal processing."""
-        from PIL import ImageDraw, ImageFont
-
         img = Image.open(keyframe_path)
         img = img.resize((1200, 630), Image.Resampling.LANCZOS)
 
-        # Add a dark gradient overlay
+        # Add a dark gradient overlay: black, alpha 0 -> 200 over the bottom half
+        half = img.height // 2
+        alpha = np.zeros((img.height, img.width), dtype=np.uint8)
+        alpha[half:, :] = (np.arange(img.height - half) * 200 // half)[:, None]
         overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
-
-        # Draw gradient from bottom
-        for y in range(img.height // 2, img.height):
-            alpha = int(200 * (y - img.height // 2) / (img.height // 2))
-            draw.line([(0, y), (img.width, y)], fill=(0, 0, 0, alpha))
+        overlay.putalpha(Image.fromarray(alpha))
 
         img = img.convert("RGBA")
         img = Image.alpha_composite(img, overlay)
 
         # Add text
         draw = ImageDraw.Draw(img)
-        try:
-            font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48)
-            font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
+        font_large = _font(DEJAVU_BOLD, 48)
+        font_small = _font(DEJAVU, 24)
 
         # Draw hype score
         draw.text((50, 500), f"🔥 HYPE: {moment.scores.hype}%", fill="white", font=font_large)
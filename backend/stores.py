@@ -0,0 +1,89 @@
+"""Bounded in-memory stores for moments and candidates."""
+
+from collections import OrderedDict
+from typing import Iterable
+
+from models import MomentAnalysis
+
+# Oldest entries are evicted past these sizes
+MAX_STORED_MOMENTS = 1000
+MAX_STORED_CANDIDATES = 5000
+
+
+class LRUDict(OrderedDict):
+    """
+    Dict capped at maxlen entries.
+
+    Storing a key (new or existing) marks it most recent; once full, the
+    least recently stored entry is evicted. Reads don't change the order, so
+    listing the store stays side-effect free.
+    """
+
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        while len(self) > self.maxlen:
+            del self[next(iter(self))]
+
+
+class MomentStore(LRUDict):
+    """
+    LRUDict of moments with a secondary index by approval_status.
+
+    Status filters then only touch matching moments instead of scanning the
+    whole store. Status changes must go through set_status so the index stays
+    in sync.
+
+    version increases on every change, so serialized views of the store can
+    be cached until it moves. Other in-place edits to a stored moment must
+    call touch().
+    """
+
+    def __init__(self, maxlen: int = MAX_STORED_MOMENTS):
+        super().__init__(maxlen)
+        # status -> ordered set of moment ids (dict keys keep insertion order)
+        self.by_status: dict[str, dict[str, None]] = {}
+        self.version = 0
+
+    def __setitem__(self, moment_id: str, moment: MomentAnalysis):
+        self._unindex(moment_id)
+        super().__setitem__(moment_id, moment)
+        self.by_status.setdefault(moment.approval_status, {})[moment_id] = None
+        self.version += 1
+
+    def __delitem__(self, moment_id: str):
+        self._unindex(moment_id)
+        super().__delitem__(moment_id)
+        self.version += 1
+
+    def touch(self):
+        """Mark the store changed after editing a stored moment in place."""
+        self.version += 1
+
+    def _unindex(self, moment_id: str):
+        old = self.get(moment_id)
+        if old is not None:
+            self.by_status.get(old.approval_status, {}).pop(moment_id, None)
+
+    def set_status(self, moment: MomentAnalysis, status: str):
+        """Update a stored moment's approval_status and the status index."""
+        self._unindex(moment.moment_id)
+        moment.approval_status = status
+        if moment.moment_id in self:
+            self.by_status.setdefault(status, {})[moment.moment_id] = None
+        self.version += 1
+
+    def with_status(self, status: str) -> list[MomentAnalysis]:
+        """Moments currently in the given approval status."""
+        ids: Iterable[str] = self.by_status.get(status, ())
+        return [self[moment_id] for moment_id in ids]
+
+    def clear(self):
+        super().clear()
+        self.by_status.clear()
+        self.version += 1
@@ -2,6 +2,7 @@
 
 import logging
 import asyncio
+import sys
 from ingest import VideoIngester, RingBuffer
 from detection import FeatureExtractor, CandidateDetector
 
@@ -29,11 +30,12 @@ async def main():
             print("⚠️  No audio found!")
 
         print("\nProcessing frames...\n")
-        print(f"{'Time':>6} | {'Motion':>6} | {'Audio':>6} | {'Combined':>8} | Status")
-        print("-" * 70)
 
         frame_count = 0
         candidates = []
+        # Per-second rows are collected and written once after the loop
+        rows = []
+        log_every = int(ingester.fps)
 
         for timestamp, frame in ingester.ingest_frames():
             # Extract features
@@ -46,17 +48,22 @@ async def main():
             candidate = candidate_detector.process_frame(timestamp, features, audio_rms)
 
             # Log every second
-            if frame_count % int(ingester.fps) == 0:
-                motion = features.get("motion", 0.0)
-                combined = (motion + audio_rms) / 2
-                status = "🔔 TRIGGER" if candidate else ""
-                print(f"{timestamp:>6.1f} | {motion:>6.3f} | {audio_rms:>6.3f} | {combined:>8.3f} | {status}")
+            if frame_count % log_every == 0:
+                rows.append((timestamp, features.motion, audio_rms, bool(candidate)))
 
             if candidate:
                 candidates.append(candidate)
 
             frame_count += 1
 
+        print(f"{'Time':>6} | {'Motion':>6} | {'Audio':>6} | {'Combined':>8} | Status")
+        print("-" * 70)
+        sys.stdout.writelines(
+            f"{t:>6.1f} | {motion:>6.3f} | {audio:>6.3f} | {(motion + audio) / 2:>8.3f} | "
+            f"{'🔔 TRIGGER' if triggered else ''}\n"
+            for t, motion, audio, triggered in rows
+        )
+
         print("\n" + "=" * 70)
         print(f"✅ Processed {frame_count} frames in {timestamp:.1f}s")
         print(f"🔔 Detected {len(candidates)} candidates")
@@ -3,11 +3,18 @@
 import sys
 from pathlib import Path
 
+import numpy as np
+
+# One random HD frame generated up front; tests derive frames from it (a
+# cheap XOR) instead of running the PRNG over ~2.7 MB per frame
+_BASE_HD = np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+
 # Test imports
 try:
     from ingest import VideoIngester, RingBuffer
-    from detection import FeatureExtractor, CandidateDetector
+    from detection import FeatureExtractor, Features, CandidateDetector
     from models import CandidateEvent
+    from gemini_analyzer import GeminiAnalyzer
     print("✅ All imports successful!")
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -22,8 +29,8 @@ def test_feature_extractor():
     extractor = FeatureExtractor()
 
     # Create dummy frames (simulating video frames)
-    frame1 = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
-    frame2 = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+    frame1 = _BASE_HD
+    frame2 = _BASE_HD ^ np.uint8(0x5A)
 
     features1 = extractor.extract_features(frame1)
     features2 = extractor.extract_features(frame2)
@@ -31,12 +38,51 @@ def test_feature_extractor():
     print(f"  Frame 1 features: {features1}")
     print(f"  Frame 2 features: {features2}")
 
-    assert "motion" in features1
-    assert "scene_change" in features1
-    assert "visual_energy" in features1
+    assert isinstance(features1, Features)
+    assert 0.0 <= features1.motion <= 1.0
+    assert 0.0 <= features1.scene_change <= 1.0
+    assert 0.0 <= features1.visual_energy <= 1.0
+    assert list(extractor.feature_vector) == list(features2)
     print("✅ FeatureExtractor working!")
 
 
+def test_motion_vector_features():
+    """Test the motion vector fast path with synthesized codec vectors."""
+    from detection import MOTION_VECTOR_DTYPE
+
+    print("\n🧪 Testing motion vector features...")
+    extractor = FeatureExtractor()
+    frame_size = (1280, 720)
+
+    # 16x16 blocks over a quarter of the frame, all pointing to the past frame
+    mvs = np.zeros(900, dtype=MOTION_VECTOR_DTYPE)
+    mvs["source"] = -1
+    mvs["w"] = 16
+    mvs["h"] = 16
+
+    still = extractor.extract_motion_features(mvs, frame_size)
+    assert still.motion == 0.0
+
+    mvs["dst_x"] = 8  # Displaced by 8 px
+    moving = extractor.extract_motion_features(mvs, frame_size)
+    print(f"  Moving blocks: {moving}")
+    assert moving.motion == 1.0
+    assert list(extractor.feature_vector) == list(moving)
+
+    # Backward (B-frame) vectors alone don't count
+    mvs["source"] = 1
+    assert extractor.extract_motion_features(mvs, frame_size).motion == 0.0
+
+    # Frames without vectors keep the previous score
+    mvs["source"] = -1
+    mvs["dst_x"][:20] = 8
+    mvs["dst_x"][20:] = 0
+    small = extractor.extract_motion_features(mvs, frame_size)
+    assert 0.0 < small.motion < 1.0
+    assert extractor.extract_motion_features(None, frame_size).motion == small.motion
+    print("✅ Motion vector features working!")
+
+
 def test_candidate_detector():
     """Test candidate detection logic."""
     print("\n🧪 Testing CandidateDetector...")
@@ -85,7 +131,7 @@ def test_ring_buffer():
 
     # Push some frames
     for i in range(10):
-        frame = np.random.randint(0, 255, (100, 100, 3), dtype=np.uint8)
+        frame = _BASE_HD[:100, :100] ^ np.uint8(i)
         buffer.push_frame(float(i), frame)
         buffer.push_features(float(i), {"motion": 0.5, "audio": 0.3})
 
@@ -98,10 +144,61 @@ def test_ring_buffer():
     print(f"  Window [2.0, 6.0]: {len(frames)} frames, {len(features)} feature sets")
     assert len(frames) == 5
     assert len(features) == 5
+    # Window frames are views into the frame slab, not copies
+    assert all(frame.base is buffer._frame_slab for _, frame in frames)
 
     print("✅ RingBuffer working!")
 
 
+def test_audio_rms_table():
+    """Test the vectorized per-frame RMS envelope against the per-frame path."""
+    print("\n🧪 Testing audio RMS table...")
+
+    # Bypass __init__ (no video file needed); set just what the RMS code reads
+    ingester = VideoIngester.__new__(VideoIngester)
+    ingester.audio_sample_rate = 16000
+    ingester.audio_samples = np.random.default_rng(1).uniform(-0.5, 0.5, 16000 * 3).astype(np.float32)
+    ingester.fps = 30.0
+    ingester._inv_fps = 1.0 / ingester.fps
+    ingester.total_frames = 90
+    ingester._rms_table = None
+
+    table = ingester._build_rms_table(1024)
+    assert table is not None and len(table) == ingester.total_frames
+
+    for idx in range(ingester.total_frames):
+        ingester.current_frame_idx = idx
+        reference = ingester.extract_audio_rms(1024)
+        if not np.isnan(table[idx]):
+            assert abs(table[idx] - reference) < 1e-5
+
+    print(f"  {np.count_nonzero(~np.isnan(table))}/{len(table)} frames precomputed")
+    print("✅ Audio RMS table matches per-frame RMS!")
+
+
+def test_keyframe_selection_contract():
+    """Test the keyframe selection properties the pipeline's snapshot relies on."""
+    print("\n🧪 Testing keyframe selection contract...")
+
+    # Irregular 30fps-ish timestamps, with t0/tr between, on and outside frames
+    timestamps = np.cumsum(np.random.default_rng(2).uniform(0.02, 0.05, 600))
+    frames = [(float(ts), _BASE_HD[:8, :8]) for ts in timestamps]
+    cases = [(5.0, 12.0), (float(timestamps[0]), 4.0), (1.0, 1.01), (-3.0, 40.0), (15.0, 20.0)]
+
+    for t0, tr in cases:
+        keyframes = GeminiAnalyzer.select_keyframes(frames, t0, tr)
+        nearest_t0 = min(frames, key=lambda f: abs(f[0] - t0))[0]
+        selected = [ts for ts, _ in keyframes]
+
+        # The share card frame is taken from the selection
+        assert nearest_t0 in selected
+        # Re-selecting from the snapshot gives the same frames
+        again = GeminiAnalyzer.select_keyframes(keyframes, t0, tr)
+        assert [ts for ts, _ in again] == selected
+
+    print("✅ Keyframe selection contract holds!")
+
+
 def test_video_ingestion_basic():
     """Test VideoIngester initialization (no actual video file needed)."""
     print("\n🧪 Testing VideoIngester initialization...")
@@ -117,8 +214,11 @@ if __name__ == "__main__":
 
     try:
         test_feature_extractor()
+        test_motion_vector_features()
         test_candidate_detector()
         test_ring_buffer()
+        test_audio_rms_table()
+        test_keyframe_selection_contract()
         test_video_ingestion_basic()
 
         print("\n" + "="*50)
@@ -5,10 +5,16 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Run on uvloop when installed, else the stdlib loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Load environment
 load_dotenv()
 
-from pipeline import process_video_simple
+from pipeline import process_video_sharded
 
 VIDEO_PATH = "/home/aditya.puranik@corsairhq.com/gex/YTDowncom_YouTube_This-Alcaraz-Sinner-point-was-so-ridicul_Media_r3UFpeA1vJw_001_1080p.mp4"
 
@@ -32,11 +38,24 @@ async def main():
     print("   5. Generate moment packages\n")
 
     try:
-        moments = await process_video_simple(VIDEO_PATH, stream_id="tennis_demo")
+        moments, shard_stats = await process_video_sharded(VIDEO_PATH, stream_id="tennis_demo")
 
         print("\n" + "=" * 70)
         print(f"✅ Pipeline Complete! Detected {len(moments)} moments\n")
 
+        for i, stats in enumerate(shard_stats):
+            end = f"{stats['end_s']:.1f}s" if stats["end_s"] is not None else "end"
+            print(f"⏱️  Shard {i} [{stats['start_s']:.1f}s → {end}]: {stats['seconds']:.2f}s")
+
+        # Candidates are sent to Gemini in batches, one round-trip per batch
+        batches = [batch for stats in shard_stats for batch in stats["batch_latencies"]]
+        if batches:
+            analyzed = sum(size for size, _ in batches)
+            total = sum(seconds for _, seconds in batches)
+            slowest = max(seconds for _, seconds in batches)
+            print(f"🤖 Gemini: {analyzed} candidates in {len(batches)} batches, "
+                  f"{total / len(batches):.2f}s avg / {slowest:.2f}s max per batch\n")
+
         if not moments:
             print("⚠️  No moments detected.")
             print("   This could mean:")
@@ -89,4 +108,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -5,6 +5,12 @@ import asyncio
 from dotenv import load_dotenv
 from pipeline import VideoPipeline
 
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Load environment variables
 load_dotenv()
 
@@ -45,6 +51,11 @@ async def main():
     print("\n" + "=" * 70)
     print(f"✅ Complete: {len(candidates)} candidates → {len(result)} moments")
 
+    # Stages run concurrently, so busy times overlap
+    print("\nStage busy time:")
+    for stage, seconds in pipeline.stage_seconds.items():
+        print(f"  {stage:>8}: {seconds:.2f}s")
+
     if result:
         print("\nMoments:")
         for m in result:
@@ -52,4 +63,7 @@ async def main():
             print(f"    Post: {m.post_copy.hype[:80]}...")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())